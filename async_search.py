@@ -0,0 +1,79 @@
+"""
+Run search engines cooperatively on an asyncio event loop.
+
+The generator engines in search (iter_dfs, iter_bfs, iter_a_star) pause every
+few expansions. search_async resumes such a generator in slices and hands
+control back to the event loop between slices, so many searches (or a search
+and a server handling requests) can share one thread without any of them
+blocking the others for the whole search.
+"""
+import asyncio
+
+async def search_async(search, slice_size=1):
+    """
+    Drive a generator search engine to completion on the running event loop.
+
+    Parameters
+    ----------
+    search : Generator
+        Generator engine from search, e.g.
+        ``iter_a_star(start, goal_test, successors, cost, heuristic, every=64)``.
+        Its ``every`` argument sets how many expansions run between pauses.
+    slice_size : int
+        Number of pauses the search may pass before yielding to the event
+        loop.
+
+    Returns
+    -------
+    found : Generic
+        Node corresponding to successful goal_test.
+        Returns None if search fails.
+
+    Cancelling the task closes the generator, so no partially-run search is
+    left behind.
+    """
+    try:
+        while True:
+            for _ in range(slice_size):
+                next(search)
+            await asyncio.sleep(0)
+    except StopIteration as stop:
+        return stop.value
+    finally:
+        search.close()
+
+if __name__ == "__main__":
+    import random
+    import time
+    from maze import Maze, MazeLocation, grid_cost, manhattan_distance
+    from search import a_star, iter_a_star
+
+    nrows, ncols, nsearches = 100, 100, 200
+    random.seed(0)
+    m = Maze(nrows, ncols, start=MazeLocation(0, 0),
+             end=MazeLocation(nrows - 1, ncols - 1))
+    goals = [MazeLocation(random.randrange(nrows), random.randrange(ncols))
+             for _ in range(nsearches)]
+
+    def engine(goal, **kwargs):
+        return iter_a_star(m.start, lambda loc: loc == goal,
+                           m.possible_next_locations, grid_cost,
+                           manhattan_distance(goal), **kwargs)
+
+    tic = time.perf_counter()
+    serial = [a_star(m.start, lambda loc: loc == goal,
+                     m.possible_next_locations, grid_cost,
+                     manhattan_distance(goal)) for goal in goals]
+    toc = time.perf_counter()
+    print("Serial:     {} searches in {:.3f} s".format(nsearches, toc - tic))
+
+    async def main():
+        return await asyncio.gather(*(search_async(engine(goal, every=64))
+                                      for goal in goals))
+
+    tic = time.perf_counter()
+    concurrent = asyncio.run(main())
+    toc = time.perf_counter()
+    print("Concurrent: {} searches in {:.3f} s".format(nsearches, toc - tic))
+    assert ([None if n is None else n.state for n in serial] ==
+            [None if n is None else n.state for n in concurrent])
@@ -0,0 +1,130 @@
+"""
+Expansions saved by landmark (ALT) heuristics per MB of distance tables, for
+several landmark selection strategies and landmark counts.
+
+On a maze, A* with the ALT heuristic (on its own, and combined with the
+manhattan distance) is compared with A* using the manhattan distance. On a
+weighted road grid, which has no heuristic of its own, it is compared with A*
+using no heuristic (i.e. Dijkstra's algorithm stopped at the goal).
+
+Run from within the benchmarks directory.
+"""
+import sys
+sys.path.append('..')
+sys.path.append('../graph')
+
+from heapq import heappush, heappop
+import random
+import time
+
+from landmarks import maze_landmarks, graph_landmarks
+from search import a_star, SearchStats
+from maze import Maze, MazeLocation, grid_cost, manhattan_distance
+from priority_queues import road_grid
+
+def maze_queries(m, count):
+    """
+    Pairs of connected open cells.
+    """
+    queries = []
+    while len(queries) < count:
+        start, goal = [MazeLocation(random.randrange(m.nrows),
+                                    random.randrange(m.ncols))
+                       for _ in range(2)]
+        if m.connected(start, goal):
+            queries.append((start, goal))
+    return queries
+
+def maze_expansions(m, queries, heuristic):
+    expanded = 0
+    tic = time.perf_counter()
+    for start, goal in queries:
+        stats = SearchStats()
+        a_star(start, lambda loc: loc == goal, m.possible_next_locations,
+               grid_cost, heuristic(goal), consistent=True, stats=stats)
+        expanded += stats.expanded
+    return expanded / len(queries), time.perf_counter() - tic
+
+def graph_expansions(wg, queries, heuristic):
+    """
+    A* over the weighted edges of a graph, returning the mean number of
+    expanded vertices and the total time.
+    """
+    expanded = 0
+    tic = time.perf_counter()
+    for start, goal in queries:
+        h = heuristic(goal)
+        goal_index = wg.index_of(goal)
+        cost_to = {wg.index_of(start) : 0}
+        closed = set()
+        frontier = [(h(start), wg.index_of(start))]
+        while frontier:
+            _, u = heappop(frontier)
+            if u in closed:
+                continue
+            if u == goal_index:
+                break
+            closed.add(u)
+            for edge in wg.edges_for_index(u):
+                new_cost = cost_to[u] + edge.weight
+                if edge.v not in closed and new_cost < cost_to.get(
+                        edge.v, float("inf")):
+                    cost_to[edge.v] = new_cost
+                    heappush(frontier, (new_cost + h(wg.vertex_at(edge.v)),
+                                        edge.v))
+        expanded += len(closed)
+    return expanded / len(queries), time.perf_counter() - tic
+
+def report(label, expanded, elapsed, baseline, nbytes):
+    megabytes = nbytes / 2**20
+    print("  {:<15} expanded: {:>8.0f}  time: {:.3f} s  tables: {:>6.2f} MB  "
+          "saved per MB: {:>8.0f}".format(label, expanded, elapsed, megabytes,
+          (baseline - expanded) / megabytes))
+
+def benchmark_maze(size=300, blocked_fraction=0.3, counts=(1, 2, 4, 8, 16),
+                   nqueries=20, seed=0):
+    random.seed(seed)
+    m = Maze(size, size, blocked_fraction=blocked_fraction,
+             start=MazeLocation(0, 0), end=MazeLocation(size - 1, size - 1))
+    queries = maze_queries(m, nqueries)
+    print("{0}x{0} maze, {1:.0%} blocked, {2} queries".format(
+          size, blocked_fraction, nqueries))
+    baseline, elapsed = maze_expansions(m, queries, manhattan_distance)
+    print("  {:<15} expanded: {:>8.0f}  time: {:.3f} s".format(
+          "manhattan", baseline, elapsed))
+    for strategy in ("farthest", "perimeter", "random"):
+        for count in counts:
+            landmarks = maze_landmarks(m, count, strategy, seed=seed)
+            expanded, elapsed = maze_expansions(m, queries,
+                                                landmarks.heuristic)
+            report("{} K={}".format(strategy, count), expanded, elapsed,
+                   baseline, landmarks.nbytes)
+            expanded, elapsed = maze_expansions(
+                m, queries, lambda goal: landmarks.heuristic(
+                    goal, fallback=manhattan_distance(goal)))
+            report("  + manhattan", expanded, elapsed, baseline,
+                   landmarks.nbytes)
+
+def benchmark_graph(nrows=100, ncols=100, counts=(1, 2, 4, 8, 16),
+                    nqueries=20, seed=0):
+    random.seed(seed)
+    wg = road_grid(nrows, ncols, seed=seed)
+    queries = [tuple(wg.vertex_at(random.randrange(wg.vertex_count))
+                     for _ in range(2)) for _ in range(nqueries)]
+    print("{}x{} road grid ({} vertices), {} queries".format(
+          nrows, ncols, wg.vertex_count, nqueries))
+    baseline, elapsed = graph_expansions(wg, queries,
+                                         lambda goal: lambda vertex: 0)
+    print("  {:<15} expanded: {:>8.0f}  time: {:.3f} s".format(
+          "no heuristic", baseline, elapsed))
+    for strategy in ("farthest", "random"):
+        for count in counts:
+            landmarks = graph_landmarks(wg, count, strategy, seed=seed)
+            expanded, elapsed = graph_expansions(wg, queries,
+                                                 landmarks.heuristic)
+            report("{} K={}".format(strategy, count), expanded, elapsed,
+                   baseline, landmarks.nbytes)
+
+if __name__ == "__main__":
+    benchmark_maze()
+    benchmark_graph()
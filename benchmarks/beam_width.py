@@ -0,0 +1,68 @@
+"""
+Solution quality and runtime of beam search against A* on generated mazes,
+for a range of beam widths.
+
+For every beam width, reports how many mazes were solved within 4 * size
+layers, the mean ratio of the beam search path cost to the optimal (A*) path
+cost over the solved mazes, the total time and the largest frontier (per
+layer, for beam search).
+
+Run from within the benchmarks directory.
+"""
+import sys
+sys.path.append('..')
+
+import time
+
+from search import a_star, beam_search, SearchStats
+from maze import grid_cost, manhattan_distance
+from helpers import solvable_mazes
+
+def optimal_costs(mazes):
+    """
+    Optimal path cost of every maze, with the total time and the largest
+    frontier of A* over all of them.
+    """
+    costs = []
+    elapsed, peak = 0.0, 0
+    for m in mazes:
+        stats = SearchStats()
+        tic = time.perf_counter()
+        solution = a_star(m.start, m.goal_test, m.possible_next_locations,
+                          grid_cost, manhattan_distance(m.goal),
+                          consistent=True, stats=stats)
+        elapsed += time.perf_counter() - tic
+        costs.append(solution.cost)
+        peak = max(peak, stats.peak_frontier)
+    return costs, elapsed, peak
+
+def benchmark(size=150, blocked_fraction=0.3, count=10,
+              beam_widths=(1, 4, 16, 64, 256), seed=0):
+    mazes = solvable_mazes(size, blocked_fraction, count, seed)
+    costs, elapsed, peak = optimal_costs(mazes)
+    print("{0} solvable {1}x{1} mazes, {2:.0%} blocked".format(
+          count, size, blocked_fraction))
+    print("  a_star       solved: {:>3}  cost ratio: 1.000  time: {:.3f} s  "
+          "peak frontier: {}".format(count, elapsed, peak))
+    for beam_width in beam_widths:
+        solved, ratio, peak, elapsed = 0, 0.0, 0, 0.0
+        for m, optimal in zip(mazes, costs):
+            stats = SearchStats()
+            tic = time.perf_counter()
+            solution = beam_search(m.start, m.goal_test,
+                                   m.possible_next_locations, grid_cost,
+                                   manhattan_distance(m.goal),
+                                   beam_width=beam_width,
+                                   max_depth=4 * size, stats=stats)
+            elapsed += time.perf_counter() - tic
+            peak = max(peak, stats.peak_frontier)
+            if solution is not None:
+                solved += 1
+                ratio += solution.cost / optimal
+        ratio = ratio / solved if solved else float("nan")
+        print("  beam K={:<4}  solved: {:>3}  cost ratio: {:.3f}  "
+              "time: {:.3f} s  peak frontier: {}".format(
+              beam_width, solved, ratio, elapsed, peak))
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,47 @@
+"""
+Compare expanded nodes and runtime of unidirectional and bidirectional
+breadth-first and A* search on open mazes.
+
+Run from within the benchmarks directory.
+"""
+import sys
+sys.path.append('..')
+
+import random
+import time
+
+from search import (bfs, a_star, bidirectional_bfs, bidirectional_a_star,
+                    node_to_path)
+from maze import Maze, MazeLocation, grid_cost, manhattan_distance
+from helpers import CountingSuccessors
+
+def benchmark(sizes=(50, 100, 200, 400), blocked_fraction=0.1):
+    random.seed(0)
+    for size in sizes:
+        start = MazeLocation(size // 2, 0)
+        goal = MazeLocation(size // 2, size - 1)
+        m = Maze(size, size, blocked_fraction=blocked_fraction,
+                 start=start, end=goal)
+        print("{0}x{0} maze, {1:.0%} blocked".format(size, blocked_fraction))
+        runs = (
+            ("bfs", lambda s: bfs(start, m.goal_test, s)),
+            ("bidirectional bfs",
+             lambda s: bidirectional_bfs(start, goal, s)),
+            ("a_star", lambda s: a_star(start, m.goal_test, s, grid_cost,
+                                        manhattan_distance(goal))),
+            ("bidirectional a_star",
+             lambda s: bidirectional_a_star(start, goal, s, grid_cost,
+                                            manhattan_distance(goal),
+                                            manhattan_distance(start))),
+        )
+        for label, run in runs:
+            successors = CountingSuccessors(m.possible_next_locations)
+            tic = time.perf_counter()
+            solution = run(successors)
+            toc = time.perf_counter()
+            length = None if solution is None else len(node_to_path(solution))
+            print("  {:<21} expanded: {:>7}  path length: {}  time: {:.4f} s"
+                  .format(label, successors.calls, length, toc - tic))
+
+if __name__ == "__main__":
+    benchmark()
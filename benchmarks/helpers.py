@@ -0,0 +1,49 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Import from a script within the benchmarks directory, after adding the parent
+directory to sys.path.
+"""
+from maze import Maze, MazeLocation
+
+class CountingSuccessors(object):
+    """
+    Wrap a successor function and count how many states it expands.
+    """
+    def __init__(self, successors):
+        self._successors = successors
+        self.calls = 0
+
+    def __call__(self, state):
+        self.calls += 1
+        return self._successors(state)
+
+def solvable_maze(size, blocked_fraction, seed):
+    """
+    Build a size x size maze whose corners are connected, from the first
+    seed counting up from seed that gives one.
+
+    Returns
+    -------
+    maze, seed : Maze, int
+        The maze and the seed it was built from.
+    """
+    while True:
+        m = Maze(size, size, blocked_fraction=blocked_fraction,
+                 start=MazeLocation(0, 0),
+                 end=MazeLocation(size - 1, size - 1), seed=seed)
+        if m.goal_reachable(m.start):
+            return m, seed
+        seed += 1
+
+def solvable_mazes(size, blocked_fraction, count, seed):
+    """
+    The first count mazes built by solvable_maze from seeds counting up from
+    seed.
+    """
+    mazes = []
+    while len(mazes) < count:
+        m, seed = solvable_maze(size, blocked_fraction, seed)
+        mazes.append(m)
+        seed += 1
+    return mazes
@@ -0,0 +1,83 @@
+"""
+Compare hierarchical pathfinding (HPA*) with flat A* on cross-map queries.
+
+For several cluster sizes, reports the time and memory needed to build the
+abstract graph, and the mean query latency, expansions and path length
+ratio (HPA* path over the optimal A* path) against flat A*.
+
+Run from within the benchmarks directory.
+"""
+import sys
+sys.path.append('..')
+
+import random
+import time
+import tracemalloc
+
+from hierarchical import HPAStar
+from search import a_star, node_to_path, SearchStats
+from maze import Maze, MazeLocation, grid_cost, manhattan_distance
+
+def cross_map_queries(m, count):
+    """
+    Pairs of open cells in opposite quarters of the maze.
+    """
+    def open_cell(rows, cols):
+        while True:
+            loc = MazeLocation(random.randrange(*rows), random.randrange(*cols))
+            if not m.is_blocked(loc) and m.connected(loc, m.start):
+                return loc
+    near = (0, m.nrows // 4), (0, m.ncols // 4)
+    far = (3 * m.nrows // 4, m.nrows), (3 * m.ncols // 4, m.ncols)
+    return [(open_cell(*near), open_cell(*far)) for _ in range(count)]
+
+def benchmark(size=512, blocked_fraction=0.2, cluster_sizes=(8, 16, 32),
+              nqueries=20, seed=0):
+    random.seed(seed)
+    m = Maze(size, size, blocked_fraction=blocked_fraction,
+             start=MazeLocation(0, 0), end=MazeLocation(size - 1, size - 1))
+    queries = cross_map_queries(m, nqueries)
+    print("{0}x{0} maze, {1:.0%} blocked, {2} cross-map queries".format(
+          size, blocked_fraction, nqueries))
+
+    optimal, expanded, elapsed = [], 0, 0.0
+    for start, goal in queries:
+        stats = SearchStats()
+        tic = time.perf_counter()
+        solution = a_star(start, lambda loc: loc == goal,
+                          m.possible_next_locations, grid_cost,
+                          manhattan_distance(goal), consistent=True,
+                          stats=stats)
+        elapsed += time.perf_counter() - tic
+        expanded += stats.expanded
+        optimal.append(len(node_to_path(solution)))
+    print("  a_star         query: {:.4f} s  expanded: {:>7.0f}".format(
+          elapsed / nqueries, expanded / nqueries))
+
+    for cluster_size in cluster_sizes:
+        tic = time.perf_counter()
+        planner = HPAStar(m, cluster_size=cluster_size)
+        toc = time.perf_counter()
+        # Measure memory on a second build, as tracing slows it down
+        tracemalloc.start()
+        traced = HPAStar(m, cluster_size=cluster_size)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del traced
+        print("  hpa* {0:>2}x{0:<2}    build: {1:.3f} s  memory: {2:.1f} MB  "
+              "abstract graph: {3} nodes, {4} edges".format(
+              cluster_size, toc - tic, memory / 2**20, planner.node_count,
+              planner.edge_count))
+        ratio, expanded, elapsed = 0.0, 0, 0.0
+        for (start, goal), length in zip(queries, optimal):
+            tic = time.perf_counter()
+            path = planner.plan(start, goal)
+            elapsed += time.perf_counter() - tic
+            expanded += planner.expanded
+            ratio += (len(path) - 1) / (length - 1)
+        print("                 query: {:.4f} s  expanded: {:>7.0f}  "
+              "path ratio: {:.3f}".format(elapsed / nqueries,
+              expanded / nqueries, ratio / nqueries))
+
+if __name__ == "__main__":
+    benchmark()
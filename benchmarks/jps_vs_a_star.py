@@ -0,0 +1,46 @@
+"""
+Compare Jump Point Search with A* (manhattan heuristic) on uniform-cost mazes
+at several blocked fractions.
+
+Run from within the benchmarks directory.
+"""
+import sys
+sys.path.append('..')
+
+import random
+import time
+
+from jump_point_search import jps
+from search import a_star, node_to_path, SearchStats
+from maze import Maze, MazeLocation, grid_cost, manhattan_distance
+
+def benchmark(size=300, blocked_fractions=(0.0, 0.1, 0.2, 0.3, 0.4), seed=0):
+    start = MazeLocation(0, 0)
+    goal = MazeLocation(size - 1, size - 1)
+    for blocked_fraction in blocked_fractions:
+        random.seed(seed)
+        m = Maze(size, size, blocked_fraction=blocked_fraction, start=start,
+                 end=goal)
+        blocked = m.blocked_mask().tolist()
+        print("{0}x{0} maze, {1:.0%} blocked".format(size, blocked_fraction))
+
+        stats = SearchStats()
+        tic = time.perf_counter()
+        solution = a_star(start, m.goal_test, m.possible_next_locations,
+                          grid_cost, manhattan_distance(goal),
+                          consistent=True, stats=stats)
+        toc = time.perf_counter()
+        length = None if solution is None else len(node_to_path(solution))
+        print("  a_star  expanded: {:>7}  path length: {}  time: {:.4f} s"
+              .format(stats.expanded, length, toc - tic))
+
+        expanded = []
+        tic = time.perf_counter()
+        path = jps(blocked, start, goal, expanded=expanded)
+        toc = time.perf_counter()
+        length = None if path is None else len(path)
+        print("  jps     expanded: {:>7}  path length: {}  time: {:.4f} s"
+              .format(len(expanded), length, toc - tic))
+
+if __name__ == "__main__":
+    benchmark()
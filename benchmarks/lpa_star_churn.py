@@ -0,0 +1,68 @@
+"""
+Compare repairing a path with LPA* after 1% of the maze cells change against
+running A* again from scratch.
+
+Run from within the benchmarks directory.
+"""
+import sys
+sys.path.append('..')
+
+import random
+import time
+
+from replanning import LPAStar
+from search import a_star, SearchStats
+from maze import Maze, MazeLocation, grid_cost, manhattan_distance
+
+def churn(maze, fraction, rng):
+    """
+    Flip the blocked state of a random fraction of the cells (other than
+    the start and goal) and return the changed cells.
+    """
+    changed = []
+    num_changes = int(fraction * maze.nrows * maze.ncols)
+    while len(changed) < num_changes:
+        loc = MazeLocation(rng.randrange(maze.nrows), rng.randrange(maze.ncols))
+        if loc == maze.start or loc == maze.goal:
+            continue
+        maze.set_blocked(loc, not maze.is_blocked(loc))
+        changed.append(loc)
+    return changed
+
+def benchmark(size=150, blocked_fraction=0.2, churn_fraction=0.01,
+              rounds=5, seed=0):
+    rng = random.Random(seed)
+    random.seed(seed)
+    goal = MazeLocation(size - 1, size - 1)
+    m = Maze(size, size, blocked_fraction=blocked_fraction,
+             start=MazeLocation(0, 0), end=goal)
+    planner = LPAStar(m)
+    tic = time.perf_counter()
+    planner.plan()
+    toc = time.perf_counter()
+    print("{0}x{0} maze, initial LPA* plan: {1} expansions, {2:.4f} s".format(
+          size, planner.expanded, toc - tic))
+    print("{:.0%} cell churn per round".format(churn_fraction))
+    for _ in range(rounds):
+        changed = churn(m, churn_fraction, rng)
+
+        tic = time.perf_counter()
+        planner.update(changed)
+        path = planner.plan()
+        toc = time.perf_counter()
+        length = None if path is None else len(path)
+        print("  LPA* repair  expanded: {:>6}  path length: {}  time: {:.4f} s"
+              .format(planner.expanded, length, toc - tic))
+
+        stats = SearchStats()
+        tic = time.perf_counter()
+        solution = a_star(m.start, m.goal_test, m.possible_next_locations,
+                          grid_cost, manhattan_distance(goal),
+                          consistent=True, stats=stats)
+        toc = time.perf_counter()
+        length = None if solution is None else int(solution.cost) + 1
+        print("  A* from scratch  expanded: {:>6}  path length: {}  "
+              "time: {:.4f} s".format(stats.expanded, length, toc - tic))
+
+if __name__ == "__main__":
+    benchmark()
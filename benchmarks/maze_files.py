@@ -0,0 +1,69 @@
+"""
+Save and memory-map mazes in the binary maze format.
+
+Checks that a saved maze loads back unchanged, then creates (sparse) maze
+files from 100 MB up to 10 GB and shows that opening them takes constant
+time, and that a search near a corner of the largest one only pages in the
+part of the grid it touches.
+
+Run from within the benchmarks directory.
+"""
+import sys
+sys.path.append('..')
+
+import os
+import random
+import resource
+import tempfile
+import time
+
+from search import a_star, node_to_path
+from maze import (Maze, MazeLocation, create_maze_file, grid_cost,
+                  manhattan_distance)
+
+def round_trip(directory, size=1000, seed=0):
+    random.seed(seed)
+    m = Maze(size, size, start=MazeLocation(0, 0),
+             end=MazeLocation(size - 1, size - 1))
+    path = os.path.join(directory, "round_trip.maze")
+    m.save(path)
+    loaded = Maze.load(path)
+    assert str(loaded) == str(m)
+    assert (loaded.start, loaded.goal) == (m.start, m.goal)
+    print("{0}x{0} maze saves and loads back unchanged".format(size))
+
+def open_large(directory, sizes=(10000, 30000, 50000, 100000),
+               corner=300, seed=0):
+    for size in sizes:
+        path = os.path.join(directory, "{}.maze".format(size))
+        tic = time.perf_counter()
+        create_maze_file(path, size, size, end=MazeLocation(corner, corner))
+        toc = time.perf_counter()
+        created = toc - tic
+        tic = time.perf_counter()
+        m = Maze.load(path, mode="r+")
+        toc = time.perf_counter()
+        print("{0}x{0} ({1:.1f} GB): create {2:.4f} s  load {3:.6f} s".format(
+              size, os.path.getsize(path) / 1e9, created, toc - tic))
+
+    # Block a few cells and search in the top left corner of the last maze
+    random.seed(seed)
+    for _ in range(corner * corner // 5):
+        loc = MazeLocation(random.randrange(corner), random.randrange(corner))
+        if loc != m.start and loc != m.goal:
+            m.set_blocked(loc)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tic = time.perf_counter()
+    solution = a_star(m.start, m.goal_test, m.possible_next_locations,
+                      grid_cost, manhattan_distance(m.goal), consistent=True)
+    toc = time.perf_counter()
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    length = None if solution is None else len(node_to_path(solution))
+    print("a_star to ({0}, {0}) on the {1}x{1} maze: path length {2}, "
+          "{3:.3f} s, peak RSS grew by {4:.1f} MB".format(
+          corner, m.nrows, length, toc - tic, (after - before) / 1024))
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        round_trip(directory)
+        open_large(directory)
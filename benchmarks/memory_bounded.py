@@ -0,0 +1,46 @@
+"""
+Compare peak memory and node expansions of A*, IDA* (without and with a
+transposition table) and SMA* (at several memory caps) on random mazes.
+
+Run from within the benchmarks directory.
+"""
+import sys
+sys.path.append('..')
+
+import time
+import tracemalloc
+
+from search import a_star, ida_star, sma_star
+from maze import grid_cost, manhattan_distance
+from helpers import CountingSuccessors, solvable_maze
+
+def benchmark(sizes=(15, 30, 60), blocked_fraction=0.25, seed=1):
+    for size in sizes:
+        # IDA* and SMA* can spend a very long time proving that a goal is
+        # unreachable, so unsolvable mazes are skipped
+        m, _ = solvable_maze(size, blocked_fraction, seed)
+        start, goal = m.start, m.goal
+        heuristic = manhattan_distance(goal)
+        print("{0}x{0} maze, {1:.0%} blocked".format(size, blocked_fraction))
+        engines = [("a_star", a_star, {}), ("ida_star", ida_star, {}),
+                   ("ida_star(tt)", ida_star, {"transpositions" : True})]
+        for max_nodes in (size * size // 2, size * size // 4, 3 * size):
+            engines.append(("sma_star({})".format(max_nodes), sma_star,
+                            {"max_nodes" : max_nodes}))
+        for label, engine, kwargs in engines:
+            successors = CountingSuccessors(m.possible_next_locations)
+            tracemalloc.start()
+            tic = time.perf_counter()
+            solution = engine(start, m.goal_test, successors, grid_cost,
+                              heuristic, **kwargs)
+            toc = time.perf_counter()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            path_cost = None if solution is None else solution.cost
+            print("  {:<16} cost: {:>6}  expanded: {:>8}  peak memory: "
+                  "{:>8.1f} kB  time: {:.3f} s".format(
+                      label, str(path_cost), successors.calls, peak / 1024,
+                      toc - tic))
+
+if __name__ == "__main__":
+    benchmark()
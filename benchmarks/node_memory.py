@@ -0,0 +1,72 @@
+"""
+Measure the memory cost of a search node: the original Node with a __dict__,
+the slotted Node and the parallel arrays of a NodeArena. Then compare peak
+memory of a_star and arena_a_star on a large open maze.
+
+Run from within the benchmarks directory.
+"""
+import sys
+sys.path.append('..')
+
+import random
+import time
+import tracemalloc
+
+from search import Node, NodeArena, a_star, arena_a_star
+from maze import Maze, MazeLocation, grid_cost, manhattan_distance
+
+class DictNode(object):
+    """
+    Node as it was before __slots__, for comparison.
+    """
+    def __init__(self, state, parent_node, cost=0.0, heuristic=0.0):
+        self.state = state
+        self.parent = parent_node
+        self.cost = cost
+        self.heuristic = heuristic
+
+def bytes_per_node(num_nodes=200000):
+    """
+    Traced bytes per node for a chain of num_nodes nodes. States are
+    integers created before tracing starts so only the nodes are counted.
+    """
+    states = list(range(num_nodes))
+    results = {}
+    for label, node_class in (("dict Node", DictNode), ("slots Node", Node)):
+        tracemalloc.start()
+        node = None
+        for state in states:
+            node = node_class(state, node, 1.5 * state, 0.5)
+        results[label] = tracemalloc.get_traced_memory()[0] / num_nodes
+        tracemalloc.stop()
+        del node
+    tracemalloc.start()
+    arena = NodeArena()
+    for state in states:
+        arena.add(state, state - 1, 1.5 * state, 0.5)
+    results["arena"] = tracemalloc.get_traced_memory()[0] / num_nodes
+    tracemalloc.stop()
+    return results
+
+def benchmark_search(size=300):
+    random.seed(0)
+    goal = MazeLocation(size - 1, size - 1)
+    m = Maze(size, size, blocked_fraction=0.2, start=MazeLocation(0, 0),
+             end=goal)
+    print("{0}x{0} maze search".format(size))
+    for label, engine in (("a_star", a_star), ("arena_a_star", arena_a_star)):
+        tracemalloc.start()
+        tic = time.perf_counter()
+        engine(m.start, m.goal_test, m.possible_next_locations, grid_cost,
+               manhattan_distance(goal))
+        toc = time.perf_counter()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print("  {:<13} peak memory: {:>8.1f} kB  time: {:.3f} s".format(
+              label, peak / 1024, toc - tic))
+
+if __name__ == "__main__":
+    print("Memory per node")
+    for label, size in bytes_per_node().items():
+        print("  {:<11} {:6.1f} bytes".format(label, size))
+    benchmark_search()
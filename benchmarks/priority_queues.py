@@ -0,0 +1,100 @@
+"""
+Compare the lazy-insertion PriorityQueue against the IndexedPriorityQueue for
+Dijkstra's algorithm on a synthetic road network, and against both the
+IndexedPriorityQueue and the BucketQueue for A* on a maze.
+
+Run from within the benchmarks directory.
+"""
+import sys
+sys.path.append('..')
+sys.path.append('../graph')
+
+import random
+import time
+
+from data_structures import PriorityQueue, IndexedPriorityQueue, BucketQueue
+from graph import WeightedGraph
+from dijkstra import dijkstra
+from search import a_star, node_to_path
+from maze import Maze, MazeLocation, grid_cost, manhattan_distance
+
+class CountingQueue(object):
+    """
+    Mixin for a frontier class that records its peak size and the number of
+    pops, e.g. ``class Counting(CountingQueue, PriorityQueue)``.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.peak_size = 0
+        self.pops = 0
+
+    def push(self, item):
+        super().push(item)
+        self.peak_size = max(self.peak_size, len(self))
+
+    def pop(self):
+        self.pops += 1
+        return super().pop()
+
+class CountingPriorityQueue(CountingQueue, PriorityQueue):
+    pass
+
+class CountingIndexedPriorityQueue(CountingQueue, IndexedPriorityQueue):
+    pass
+
+class CountingBucketQueue(CountingQueue, BucketQueue):
+    pass
+
+def road_grid(nrows, ncols, seed=0):
+    """
+    Build a weighted grid graph with random edge weights as a stand-in for a
+    road network.
+    """
+    rng = random.Random(seed)
+    wg = WeightedGraph([(r, c) for r in range(nrows) for c in range(ncols)])
+    for r in range(nrows):
+        for c in range(ncols):
+            u = r * ncols + c
+            if c + 1 < ncols:
+                wg.add_edge_by_indices(u, u + 1, rng.randint(1, 100))
+            if r + 1 < nrows:
+                wg.add_edge_by_indices(u, u + ncols, rng.randint(1, 100))
+    return wg
+
+def report(label, queue, elapsed):
+    print("  {:<8} peak queue size: {:>7}  pops: {:>7}  time: {:.4f} s".format(
+          label, queue.peak_size, queue.pops, elapsed))
+
+def benchmark_dijkstra(nrows=150, ncols=150):
+    wg = road_grid(nrows, ncols)
+    print("Dijkstra on {}x{} road grid ({} vertices)".format(
+          nrows, ncols, wg.vertex_count))
+    for label, queue in (
+            ("lazy", CountingPriorityQueue()),
+            ("indexed", CountingIndexedPriorityQueue(key=lambda n: n.vertex))):
+        tic = time.perf_counter()
+        dijkstra(wg, (0, 0), node_queue=queue)
+        toc = time.perf_counter()
+        report(label, queue, toc - tic)
+
+def benchmark_a_star(nrows=300, ncols=300):
+    random.seed(0)
+    goal = MazeLocation(nrows - 1, ncols - 1)
+    m = Maze(nrows, ncols, start=MazeLocation(0, 0), end=goal)
+    print("A* on {}x{} maze".format(nrows, ncols))
+    for label, queue in (
+            ("lazy", CountingPriorityQueue()),
+            ("indexed", CountingIndexedPriorityQueue(key=lambda n: n.state)),
+            ("bucket", CountingBucketQueue(
+                priority=lambda n: n.cost + n.heuristic))):
+        tic = time.perf_counter()
+        solution = a_star(m.start, m.goal_test, m.possible_next_locations,
+                          grid_cost, manhattan_distance(goal), frontier=queue)
+        toc = time.perf_counter()
+        report(label, queue, toc - tic)
+        if solution is not None:
+            print("           path length: {}".format(len(node_to_path(solution))))
+
+if __name__ == "__main__":
+    benchmark_dijkstra()
+    benchmark_a_star()
@@ -0,0 +1,199 @@
+"""
+Reproducible benchmark of the maze search engines.
+
+Builds seeded, solvable mazes over a grid of sizes and blocked fractions and
+runs dfs, bfs and a_star (with the euclidean and the manhattan heuristic) on
+each.
+Every run is repeated after a warmup and timed with perf_counter; expansion
+counts come from one extra run with SearchStats, so that collecting them does
+not slow down the timed runs. Results are written as JSON and can be compared
+against a saved baseline to flag regressions.
+
+Run from within the benchmarks directory, e.g.::
+
+    python search_harness.py --output baseline.json
+    python search_harness.py --baseline baseline.json
+"""
+import sys
+sys.path.append('..')
+
+import argparse
+import json
+import platform
+import time
+
+import numpy as np
+
+from search import dfs, bfs, a_star, node_to_path, SearchStats
+from maze import grid_cost, euclidean_distance, manhattan_distance
+from helpers import solvable_maze
+
+def run_dfs(m, stats=None):
+    return dfs(m.start, m.goal_test, m.possible_next_locations, stats=stats)
+
+def run_bfs(m, stats=None):
+    return bfs(m.start, m.goal_test, m.possible_next_locations, stats=stats)
+
+def run_a_star_euclidean(m, stats=None):
+    return a_star(m.start, m.goal_test, m.possible_next_locations, grid_cost,
+                  euclidean_distance(m.goal), stats=stats)
+
+def run_a_star_manhattan(m, stats=None):
+    return a_star(m.start, m.goal_test, m.possible_next_locations, grid_cost,
+                  manhattan_distance(m.goal), stats=stats)
+
+ENGINES = {
+    "dfs" : run_dfs,
+    "bfs" : run_bfs,
+    "a_star_euclidean" : run_a_star_euclidean,
+    "a_star_manhattan" : run_a_star_manhattan,
+}
+
+def percentile(values, q):
+    """
+    Nearest-rank percentile q (0 to 100) of a list of values.
+    """
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1,
+                      int(np.ceil(q / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+def run(sizes, blocked_fractions, engines, repeat=5, warmup=1, seed=0):
+    """
+    Run every engine on every maze.
+
+    Returns
+    -------
+    report : dict
+        JSON-serializable report with a "meta" section describing the run
+        and one entry in "results" per (engine, size, blocked fraction).
+    """
+    results = []
+    for size in sizes:
+        for blocked_fraction in blocked_fractions:
+            m, maze_seed = solvable_maze(size, blocked_fraction, seed)
+            for name in engines:
+                engine = ENGINES[name]
+                for _ in range(warmup):
+                    engine(m)
+                times = []
+                for _ in range(repeat):
+                    tic = time.perf_counter()
+                    engine(m)
+                    times.append(time.perf_counter() - tic)
+                stats = SearchStats()
+                solution = engine(m, stats=stats)
+                results.append({
+                    "engine" : name,
+                    "size" : size,
+                    "blocked_fraction" : blocked_fraction,
+                    "maze_seed" : maze_seed,
+                    "expanded" : stats.expanded,
+                    "generated" : stats.generated,
+                    "path_length" : (None if solution is None else
+                                     len(node_to_path(solution))),
+                    "time" : {
+                        "min" : min(times),
+                        "p50" : percentile(times, 50),
+                        "p90" : percentile(times, 90),
+                        "max" : max(times),
+                        "mean" : sum(times) / len(times),
+                    },
+                })
+                print("{:<17} {:>5}x{:<5} {:>4.0%} blocked  p50: {:.5f} s  "
+                      "expanded: {}".format(name, size, size,
+                      blocked_fraction, results[-1]["time"]["p50"],
+                      stats.expanded))
+    meta = {
+        "seed" : seed,
+        "repeat" : repeat,
+        "warmup" : warmup,
+        "python" : platform.python_version(),
+        "numpy" : np.__version__,
+        "machine" : platform.machine(),
+        "created" : time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    return {"meta" : meta, "results" : results}
+
+def compare(report, baseline, tolerance=0.10, min_time=0.001):
+    """
+    Compare a report against a baseline report.
+
+    A case regresses when its median time grew by more than the tolerance
+    (a fraction of the baseline median) and by more than min_time seconds,
+    so that noise on very fast cases is not flagged. It also regresses when
+    its expansion count or path length changed, which means the engine
+    behaves differently rather than just running slower.
+
+    Returns
+    -------
+    regressions : List[str]
+        Description of every regression found.
+    """
+    def key(result):
+        return (result["engine"], result["size"], result["blocked_fraction"])
+
+    previous = {key(result) : result for result in baseline["results"]}
+    if report["meta"]["seed"] != baseline["meta"]["seed"]:
+        return ["seeds differ ({} vs {} in baseline), results are not "
+                "comparable".format(report["meta"]["seed"],
+                                    baseline["meta"]["seed"])]
+    regressions = []
+    for result in report["results"]:
+        old = previous.get(key(result))
+        if old is None:
+            continue
+        label = "{} {}x{} {:.0%} blocked".format(result["engine"],
+                                                 result["size"],
+                                                 result["size"],
+                                                 result["blocked_fraction"])
+        for field in ("maze_seed", "expanded", "path_length"):
+            if result[field] != old[field]:
+                regressions.append("{}: {} changed from {} to {}".format(
+                                   label, field, old[field], result[field]))
+        new_time, old_time = result["time"]["p50"], old["time"]["p50"]
+        if new_time - old_time > max(old_time * tolerance, min_time):
+            regressions.append("{}: median time {:.5f} s vs {:.5f} s in "
+                               "baseline ({:+.0%})".format(label, new_time,
+                               old_time, new_time / old_time - 1))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[50, 100, 200])
+    parser.add_argument("--blocked", type=float, nargs="+",
+                        default=[0.1, 0.2, 0.3])
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES),
+                        default=list(ENGINES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed growth of median times (fraction)")
+    parser.add_argument("--min-time", type=float, default=0.001,
+                        help="ignore growth of median times below this "
+                             "many seconds")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.blocked, args.engines, repeat=args.repeat,
+                 warmup=args.warmup, seed=args.seed)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance,
+                              args.min_time)
+        for regression in regressions:
+            print("REGRESSION " + regression)
+        if regressions:
+            return 1
+        print("No regressions against {}".format(args.baseline))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
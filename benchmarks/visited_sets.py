@@ -0,0 +1,68 @@
+"""
+Compare visited-set backends for dfs/bfs: the original list-based Stack, the
+default hash set, a dense BitSet and a BloomFilter.
+
+Membership throughput is measured from 10^3 to 10^7 states, followed by
+breadth-first search on open mazes of increasing size.
+
+Run from within the benchmarks directory.
+"""
+import sys
+sys.path.append('..')
+
+import random
+import time
+
+from data_structures import Stack, BitSet, BloomFilter
+from search import bfs
+from maze import Maze, MazeLocation
+
+def membership_backends(num_states):
+    """
+    Empty visited sets for num_states integer states, keyed by label.
+
+    The list-based Stack is quadratic, so it is only included for small
+    state counts.
+    """
+    backends = [("hash set", set()),
+                ("bitset", BitSet(num_states)),
+                ("bloom 1%", BloomFilter(num_states, error_rate=0.01))]
+    if num_states <= 10**4:
+        backends.insert(0, ("list", Stack()))
+    return backends
+
+def benchmark_membership(exponents=range(3, 8)):
+    print("Visited-set membership: one `in` test and one add per state")
+    for exp in exponents:
+        num_states = 10**exp
+        for label, explored in membership_backends(num_states):
+            add = explored.push if isinstance(explored, Stack) else explored.add
+            tic = time.perf_counter()
+            for state in range(num_states):
+                if state not in explored:
+                    add(state)
+            toc = time.perf_counter()
+            print("  10^{} states  {:<9} {:>9.4f} s  ({:.0f} ns/state)".format(
+                  exp, label, toc - tic, 1e9 * (toc - tic) / num_states))
+
+def benchmark_bfs(sizes=((10, 100), (100, 100), (100, 1000), (1000, 1000))):
+    print("bfs on open mazes (goal in the far corner)")
+    random.seed(0)
+    for nrows, ncols in sizes:
+        goal = MazeLocation(nrows - 1, ncols - 1)
+        m = Maze(nrows, ncols, blocked_fraction=0.0,
+                 start=MazeLocation(0, 0), end=goal)
+        backends = [("hash set", set()),
+                    ("bitset", BitSet(nrows * ncols, m.location_index)),
+                    ("bloom 1%", BloomFilter(nrows * ncols, error_rate=0.01))]
+        for label, explored in backends:
+            tic = time.perf_counter()
+            bfs(m.start, m.goal_test, m.possible_next_locations,
+                explored=explored)
+            toc = time.perf_counter()
+            print("  {}x{} {:<9} {:>9.4f} s".format(nrows, ncols, label,
+                                                    toc - tic))
+
+if __name__ == "__main__":
+    benchmark_membership()
+    benchmark_bfs()
@@ -3,6 +3,7 @@ Some data structures not included in collections
 """
 from collections import deque
 from heapq import heappush, heappop
+from math import ceil, log
 
 class Stack(list):
     """
@@ -54,3 +55,274 @@ class PriorityQueue(list):
 
     def pop(self):
         return heappop(self)
+
+class IndexedPriorityQueue(object):
+    """
+    A binary-heap priority queue that keeps track of where each item lives in
+    the heap, so that items can be looked up, updated in place or removed.
+
+    Every item is identified by a handle computed with the *key* callable
+    (e.g. the state of a search node). At most one item per handle is stored
+    in the queue at any time.
+    """
+    def __init__(self, key=lambda item: item):
+        self._key = key
+        self._heap = []
+        self._position = {}
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, handle):
+        return handle in self._position
+
+    @property
+    def empty(self):
+        return len(self._heap) == 0
+
+    def contains(self, handle):
+        """
+        Check whether an item with the given handle is in the queue.
+        """
+        return handle in self._position
+
+    def push(self, item):
+        """
+        Add a new item to the queue.
+
+        Raises a KeyError if an item with the same handle is already queued.
+        """
+        handle = self._key(item)
+        if handle in self._position:
+            raise KeyError("{} is already in the queue".format(handle))
+        self._heap.append(item)
+        self._position[handle] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def peek(self):
+        """
+        Return the smallest item without removing it from the queue.
+        """
+        return self._heap[0]
+
+    def pop(self):
+        """
+        Remove and return the smallest item in the queue.
+        """
+        return self._remove_at(0)
+
+    def decrease_key(self, item):
+        """
+        Replace the queued item that shares a handle with *item* by *item*.
+
+        The replacement must not compare greater than the item it replaces.
+        """
+        handle = self._key(item)
+        pos = self._position[handle]
+        if self._heap[pos] < item:
+            raise ValueError("New item for {} has a larger priority than "
+                             "the queued one".format(handle))
+        self._heap[pos] = item
+        self._sift_up(pos)
+
+    def remove(self, handle):
+        """
+        Remove and return the item with the given handle.
+        """
+        return self._remove_at(self._position[handle])
+
+    def _remove_at(self, pos):
+        heap = self._heap
+        item = heap[pos]
+        del self._position[self._key(item)]
+        last = heap.pop()
+        if pos < len(heap):
+            heap[pos] = last
+            self._position[self._key(last)] = pos
+            self._sift_down(pos)
+            self._sift_up(pos)
+        return item
+
+    def _sift_up(self, pos):
+        heap, position, key = self._heap, self._position, self._key
+        item = heap[pos]
+        while pos > 0:
+            parent_pos = (pos - 1) >> 1
+            parent = heap[parent_pos]
+            if not item < parent:
+                break
+            heap[pos] = parent
+            position[key(parent)] = pos
+            pos = parent_pos
+        heap[pos] = item
+        position[key(item)] = pos
+
+    def _sift_down(self, pos):
+        heap, position, key = self._heap, self._position, self._key
+        size = len(heap)
+        item = heap[pos]
+        child_pos = 2 * pos + 1
+        while child_pos < size:
+            # Pick the smaller of the two children
+            right_pos = child_pos + 1
+            if right_pos < size and heap[right_pos] < heap[child_pos]:
+                child_pos = right_pos
+            child = heap[child_pos]
+            if not child < item:
+                break
+            heap[pos] = child
+            position[key(child)] = pos
+            pos = child_pos
+            child_pos = 2 * pos + 1
+        heap[pos] = item
+        position[key(item)] = pos
+
+class BucketQueue(object):
+    """
+    A monotone bucket queue (Dial's algorithm) for small non-negative integer
+    priorities.
+
+    Items are kept in one bucket per priority value and a cursor tracks the
+    lowest possibly non-empty bucket. Because the queue is monotone (an item
+    can never be pushed with a lower priority than the last one popped), push
+    and pop are amortized O(1).
+    """
+    def __init__(self, priority=lambda item: item):
+        self._priority = priority
+        self._buckets = []
+        self._cursor = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def empty(self):
+        return self._size == 0
+
+    def push(self, item):
+        priority = self._priority(item)
+        index = int(priority)
+        if index != priority or index < 0:
+            raise ValueError("BucketQueue requires non-negative integer "
+                             "priorities, got {}".format(priority))
+        if index < self._cursor:
+            raise ValueError("BucketQueue is monotone: cannot push priority "
+                             "{} after popping {}".format(index, self._cursor))
+        buckets = self._buckets
+        if index >= len(buckets):
+            buckets.extend([] for _ in range(index - len(buckets) + 1))
+        buckets[index].append(item)
+        self._size += 1
+
+    def _advance(self):
+        if self._size == 0:
+            raise IndexError("pop from empty BucketQueue")
+        buckets = self._buckets
+        while not buckets[self._cursor]:
+            self._cursor += 1
+        return buckets[self._cursor]
+
+    def peek(self):
+        """
+        Return an item with the lowest priority without removing it.
+        """
+        return self._advance()[-1]
+
+    def pop(self):
+        """
+        Remove and return an item with the lowest priority.
+        """
+        item = self._advance().pop()
+        self._size -= 1
+        return item
+
+class BitSet(object):
+    """
+    A dense set of items that map onto the integers 0 <= i < size.
+
+    Membership is stored as a single bit per possible item, so it is a compact
+    replacement for a hash set when the item space is known up front (e.g.
+    the cells of a grid). Items that map outside that range raise an
+    IndexError.
+    """
+    def __init__(self, size, index=lambda item: item):
+        self._index = index
+        self._size = size
+        self._bits = bytearray((size + 7) >> 3)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _bit(self, item):
+        """
+        Bit index of item, checked against the size of the set.
+        """
+        i = self._index(item)
+        if not 0 <= i < self._size:
+            raise IndexError("{!r} maps onto {}, outside the BitSet range "
+                             "0 <= i < {}".format(item, i, self._size))
+        return i
+
+    def __contains__(self, item):
+        i = self._bit(item)
+        return bool(self._bits[i >> 3] & (1 << (i & 7)))
+
+    def add(self, item):
+        i = self._bit(item)
+        mask = 1 << (i & 7)
+        if not self._bits[i >> 3] & mask:
+            self._bits[i >> 3] |= mask
+            self._count += 1
+
+class BloomFilter(object):
+    """
+    A probabilistic set for very large item spaces.
+
+    Uses a fixed amount of memory sized from the expected number of items and
+    the acceptable false-positive rate. Items that were added are always
+    reported as members, but an item that was never added may be reported as
+    a member with probability roughly error_rate.
+    """
+    def __init__(self, capacity, error_rate=0.01):
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be >= 1 and 0 < error_rate < 1")
+        # Optimal number of bits and hash functions for the requested rate
+        num_bits = -capacity * log(error_rate) / log(2)**2
+        self._num_bits = max(8, int(ceil(num_bits)))
+        self._num_hashes = max(1, int(round(self._num_bits / capacity * log(2))))
+        self._bits = bytearray((self._num_bits + 7) >> 3)
+        self._count = 0
+
+    def __len__(self):
+        """
+        Number of add() calls for items not already (apparently) present.
+        """
+        return self._count
+
+    def _positions(self, item):
+        # Double hashing: h1 + i * h2 simulates num_hashes independent hashes,
+        # with h2 derived from h1 by a multiplicative mix
+        h1 = hash(item) & 0xffffffffffffffff
+        h2 = ((h1 * 0x9e3779b97f4a7c15) >> 32 | 1) & 0xffffffff
+        num_bits = self._num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self._num_hashes)]
+
+    def __contains__(self, item):
+        bits = self._bits
+        for p in self._positions(item):
+            if not bits[p >> 3] & (1 << (p & 7)):
+                return False
+        return True
+
+    def add(self, item):
+        bits = self._bits
+        new = False
+        for p in self._positions(item):
+            mask = 1 << (p & 7)
+            if not bits[p >> 3] & mask:
+                bits[p >> 3] |= mask
+                new = True
+        if new:
+            self._count += 1
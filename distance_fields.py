@@ -0,0 +1,160 @@
+"""
+Cached goal distance fields for answering many queries that share a goal.
+
+A distance field holds, for every cell of a maze, the number of moves to one
+goal cell. It takes one breadth-first search outward from the goal to build
+(moves all cost the same, so this is the Dijkstra distance too), after which
+a shortest path from any start is found by repeatedly stepping to a neighbor
+one move closer to the goal, in O(path length).
+"""
+from collections import OrderedDict
+
+from grid_search import distance_field
+from maze import MazeLocation
+
+class DistanceFieldCache(object):
+    """
+    Least recently used cache of distance fields keyed by (maze, goal), with
+    a budget on the total size of the cached fields in bytes.
+
+    Every field remembers the Maze.version it was built for and is rebuilt
+    when the maze has changed since. The cache holds references to the
+    mazes it has fields for until those fields are evicted.
+    """
+    def __init__(self, max_bytes=256 * 2**20):
+        """
+        Parameters
+        ----------
+        max_bytes : int
+            Total size of the fields to keep. A field (4 bytes per cell) that
+            is larger than the whole budget is returned without caching it.
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        # (maze, goal) -> (maze version, field), least recently used first
+        self._fields = OrderedDict()
+
+    def __len__(self):
+        return len(self._fields)
+
+    def field(self, maze, goal=None):
+        """
+        Distance field towards goal, built if it is not cached or stale.
+
+        Parameters
+        ----------
+        maze : maze.Maze
+            Maze to route on.
+        goal : MazeLocation, optional
+            Goal cell. Defaults to the goal of the maze.
+
+        Returns
+        -------
+        distance : np.ndarray
+            int32 array of shape (nrows, ncols) holding the number of moves
+            from each cell to the goal, or -1 where it cannot be reached.
+            Treat it as read-only: it is shared by later calls.
+        """
+        if goal is None:
+            goal = maze.goal
+        key = (maze, goal)
+        entry = self._fields.get(key)
+        if entry is not None:
+            version, distance = entry
+            if version == maze.version:
+                self.hits += 1
+                self._fields.move_to_end(key)
+                return distance
+            # The grid changed since this field was built
+            self._evict(key)
+        self.misses += 1
+        distance = distance_field(maze.blocked_mask(), goal)
+        if distance.nbytes <= self.max_bytes:
+            self._fields[key] = (maze.version, distance)
+            self.nbytes += distance.nbytes
+            while self.nbytes > self.max_bytes:
+                self._evict(next(iter(self._fields)))
+        return distance
+
+    def path(self, maze, start, goal=None):
+        """
+        Shortest path from start to goal, read off the cached distance field.
+
+        Moves are tried in the same order as Maze.possible_next_locations
+        (left, right, up, down), taking the first that gets one move closer
+        to the goal.
+
+        Returns
+        -------
+        path : List[MazeLocation]
+            Locations from start to goal (inclusive), or None if the goal
+            cannot be reached from start.
+        """
+        distance = self.field(maze, goal)
+        nrows, ncols = distance.shape
+        flat = memoryview(distance.reshape(-1))
+        row, col = start
+        remaining = flat[row * ncols + col]
+        if remaining < 0:
+            return None
+        path = [MazeLocation(row, col)]
+        while remaining:
+            remaining -= 1
+            index = row * ncols + col
+            if col > 0 and flat[index - 1] == remaining:
+                col -= 1
+            elif col + 1 < ncols and flat[index + 1] == remaining:
+                col += 1
+            elif row > 0 and flat[index - ncols] == remaining:
+                row -= 1
+            else:
+                row += 1
+            path.append(MazeLocation(row, col))
+        return path
+
+    def clear(self):
+        """
+        Drop every cached field.
+        """
+        self._fields.clear()
+        self.nbytes = 0
+
+    def _evict(self, key):
+        _, distance = self._fields.pop(key)
+        self.nbytes -= distance.nbytes
+
+if __name__ == "__main__":
+    import random
+    import time
+    from maze import Maze, grid_cost, manhattan_distance
+    from search import a_star, node_to_path
+    nrows, ncols, nqueries = 500, 500, 200
+    random.seed(0)
+    m = Maze(nrows, ncols, start=MazeLocation(0, 0),
+             end=MazeLocation(nrows // 2, ncols // 2))
+    starts = []
+    while len(starts) < nqueries:
+        start = MazeLocation(random.randrange(nrows), random.randrange(ncols))
+        if not m.is_blocked(start):
+            starts.append(start)
+
+    tic = time.perf_counter()
+    expected = []
+    for start in starts:
+        solution = a_star(start, m.goal_test, m.possible_next_locations,
+                          grid_cost, manhattan_distance(m.goal),
+                          consistent=True)
+        expected.append(None if solution is None else
+                        len(node_to_path(solution)))
+    toc = time.perf_counter()
+    print("a_star:         {} queries in {:.3f} s".format(nqueries, toc - tic))
+
+    cache = DistanceFieldCache()
+    tic = time.perf_counter()
+    paths = [cache.path(m, start) for start in starts]
+    toc = time.perf_counter()
+    print("distance field: {} queries in {:.3f} s ({} field built)".format(
+          nqueries, toc - tic, cache.misses))
+    assert [None if p is None else len(p) for p in paths] == expected
@@ -4,7 +4,9 @@ Fibonacci fun.
 See "Classic Computer Science Problems in Python" Ch. 1, by David Kopec
 """
 import time
-from functools import lru_cache
+from math import log10
+
+from memoize import BoundedCache, memoize
 
 def naive(n):
     """
@@ -14,25 +16,29 @@ def naive(n):
         return n
     return naive(n - 2) + naive(n - 1)
 
-# Library of previously-computed Fibonacci values, initialized with base
-# cases
-fib_lib = {0 : 0, 1 : 1}
+# Library of previously-computed Fibonacci values. Bounded, as fib(n) has
+# about 0.7 * n bits and a library of every value up to n grows as n**2
+fib_lib = BoundedCache(max_bytes=2**20)
 
 def explicit_memoization(n):
     """
     Recursive implementation of Fibonacci sequence using memoization.
 
-    Memoization is implemented explicitly with a dict.
+    Memoization is implemented explicitly with a memoize.BoundedCache.
     """
-    if n not in fib_lib:
-        fib_lib[n] = explicit_memoization(n - 2) + explicit_memoization(n - 1)
-    return fib_lib[n]
-    
-@lru_cache(maxsize=None)
+    if n < 2:
+        return n
+    value = fib_lib.get(n)
+    if value is None:
+        value = explicit_memoization(n - 2) + explicit_memoization(n - 1)
+        fib_lib.put(n, value)
+    return value
+
+@memoize(max_bytes=2**20)
 def implicit_memoization(n):
     """
-    Recursive implementation with implicit memoization using 
-    functools.lru_cache.
+    Recursive implementation with implicit memoization using
+    memoize.memoize.
     """
     if n < 2:
         return n
@@ -49,6 +55,60 @@ def iterative(n):
         n2, n1 = n1, n2 + n1
     return n1
 
+def fast_doubling(n, modulus=None):
+    """
+    Compute fib(n) (or fib(n) % modulus) in O(log n) arithmetic operations
+    with the fast doubling identities
+
+        fib(2k) = fib(k) * (2 * fib(k + 1) - fib(k))
+        fib(2k + 1) = fib(k)**2 + fib(k + 1)**2
+
+    applied to the bits of n from the most significant down.
+    """
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    a, b = 0, 1     # fib(k), fib(k + 1) for k = 0
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if modulus is not None:
+            c, d = c % modulus, d % modulus
+        if bit == "1":
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    if modulus is not None:
+        a %= modulus
+    return a
+
+def matrix(n, modulus=None):
+    """
+    Compute fib(n) (or fib(n) % modulus) from the n-th power of the matrix
+    [[1, 1], [1, 0]], which is [[fib(n + 1), fib(n)], [fib(n), fib(n - 1)]],
+    using exponentiation by squaring.
+    """
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    def multiply(x, y):
+        # 2x2 matrices stored row-major as 4-tuples
+        product = (x[0] * y[0] + x[1] * y[2], x[0] * y[1] + x[1] * y[3],
+                   x[2] * y[0] + x[3] * y[2], x[2] * y[1] + x[3] * y[3])
+        if modulus is not None:
+            product = tuple(entry % modulus for entry in product)
+        return product
+
+    result = (1, 0, 0, 1)
+    power = (1, 1, 1, 0)
+    while n:
+        if n & 1:
+            result = multiply(result, power)
+        n >>= 1
+        if n:
+            power = multiply(power, power)
+    if modulus is not None:
+        return result[1] % modulus
+    return result[1]
+
 def generator(n):
     """
     Generator for producing the entire Fibonacci sequence up to n when iterated
@@ -65,16 +125,24 @@ def generator(n):
         yield n1
 
 
-def profile(function_to_profile, fib_seq_num=30):
+def profile(function_to_profile, fib_seq_num=30, log_spaced=False):
     """
     Dumb Fibonacci function profiling.
+
+    Times function_to_profile for every n below fib_seq_num or, if
+    log_spaced, for about ten logarithmically spaced n per decade up to
+    fib_seq_num, so fast engines can be compared over very large n.
     """
-    test_range = range(fib_seq_num)
+    if log_spaced:
+        test_range = sorted({int(10 ** (k / 10))
+                             for k in range(int(10 * log10(fib_seq_num)) + 1)})
+    else:
+        test_range = range(fib_seq_num)
     compute_times = []
     for i in test_range:
-        tic = time.time()
+        tic = time.perf_counter()
         function_to_profile(i)
-        toc = time.time()
+        toc = time.perf_counter()
         compute_times.append(toc - tic)
     return test_range, compute_times
 
@@ -87,16 +155,28 @@ if __name__ == "__main__":
     fig, ax = plt.subplots()
     ax.set_title("Comparison of Fibonacci Implementations")
 
-    # Profile all implementations of Fibonacci in this file
-    import fib
-    for item in dir(fib):
-        f = getattr(fib, item)
-        if callable(f) and item not in ["profile", "lru_cache"]:
-            ax.plot(*profile(f), label=f.__name__)
+    def exhaust_generator(n):
+        # Time producing the whole sequence, not just creating the generator
+        for value in generator(n):
+            pass
+
+    # Profile every engine over logarithmically spaced n, up to the largest
+    # n it handles in reasonable time (or before the recursion limit)
+    for label, f, largest in (("naive", naive, 30),
+                              ("explicit_memoization",
+                               explicit_memoization, 900),
+                              ("implicit_memoization",
+                               implicit_memoization, 900),
+                              ("iterative", iterative, 10**5),
+                              ("generator", exhaust_generator, 10**5),
+                              ("matrix", matrix, 10**6),
+                              ("fast_doubling", fast_doubling, 10**7)):
+        ax.plot(*profile(f, largest, log_spaced=True), label=label)
 
     # Pretty-up plot
     ax.legend()
+    ax.set_xscale('log')
     ax.set_yscale('log')
     ax.set_ylabel("log(runtime) for fib(n)")
-    ax.set_xlabel("n")
+    ax.set_xlabel("log(n)")
     plt.show()
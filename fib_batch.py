@@ -0,0 +1,148 @@
+"""
+Fibonacci numbers modulo m for whole arrays of (n, m) pairs at once.
+
+fib(n) mod m repeats with a period called the Pisano period of m, so every n
+is first reduced modulo the (cached) period of its modulus. The reduced
+exponents are then evaluated together with fast doubling, the squaring step
+of the matrix power [[1, 1], [1, 0]]**n, as array arithmetic over every pair.
+"""
+from math import gcd
+
+import numpy as np
+
+from fib import fast_doubling
+from memoize import BoundedCache
+
+# Largest modulus for which products of two residues (plus one more such
+# product) cannot overflow int64
+MAX_MODULUS = 2**31
+
+# Pisano period (or a multiple of it) of the moduli seen most recently
+_pisano_periods = BoundedCache(max_entries=2**16)
+
+def _factorize(n):
+    """
+    Prime factorization of n by trial division, as a {prime : exponent} dict.
+    """
+    factors = {}
+    p = 2
+    while p * p <= n:
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+        p += 1 if p == 2 else 2
+    if n > 1:
+        factors[n] = factors.get(n, 0) + 1
+    return factors
+
+def _divisors(n):
+    divisors = [1]
+    for p, k in _factorize(n).items():
+        divisors = [d * p**e for d in divisors for e in range(k + 1)]
+    return sorted(divisors)
+
+def _prime_period(p):
+    """
+    Pisano period of a prime p: the smallest divisor d of p - 1 (if p is
+    1 or 4 mod 5) or of 2 * (p + 1) (otherwise) with fib(d) = 0 and
+    fib(d + 1) = 1 mod p.
+    """
+    if p == 2:
+        return 3
+    if p == 5:
+        return 20
+    bound = p - 1 if p % 5 in (1, 4) else 2 * (p + 1)
+    for d in _divisors(bound):
+        if fast_doubling(d, p) == 0 and fast_doubling(d + 1, p) == 1:
+            return d
+    return bound
+
+def pisano_period(m):
+    """
+    Period of fib(n) mod m, cached per modulus.
+
+    Combines the periods of the prime powers p**k dividing m, taking
+    p**(k - 1) times the period of p for each. That is the exact period for
+    every prime power known, and always a multiple of it, so it is safe to
+    reduce n by.
+    """
+    period = _pisano_periods.get(m)
+    if period is None:
+        period = 1
+        for p, k in _factorize(m).items():
+            prime_power = p**(k - 1) * _prime_period(p)
+            period = period * prime_power // gcd(period, prime_power)
+        _pisano_periods.put(m, period)
+    return period
+
+def fib_mod(n, m):
+    """
+    Compute fib(n) % m elementwise.
+
+    Parameters
+    ----------
+    n : array_like
+        Non-negative indices. Integers beyond int64 can be passed as Python
+        ints (an object array) or, up to 2**64 - 1, as uint64; they are
+        reduced by the Pisano period before any array arithmetic.
+    m : array_like
+        Moduli between 1 and MAX_MODULUS, broadcast against n.
+
+    Returns
+    -------
+    fib : np.ndarray
+        int64 array of fib(n) % m, with the broadcast shape of n and m.
+    """
+    n, m = np.broadcast_arrays(np.asarray(n), np.asarray(m))
+    shape = n.shape
+    n, m = n.ravel(), m.ravel().astype(np.int64)
+    if n.dtype == np.uint64 and n.size and n.max() > np.iinfo(np.int64).max:
+        # Would wrap around when cast to int64
+        n = n.astype(object)
+    if m.size and (m.min() < 1 or m.max() > MAX_MODULUS):
+        raise ValueError("Moduli must be between 1 and {}".format(MAX_MODULUS))
+    if n.size and n.min() < 0:
+        raise ValueError("Indices must be non-negative")
+    # Reduce every n by the period of its modulus
+    moduli, inverse = np.unique(m, return_inverse=True)
+    periods = np.array([pisano_period(int(modulus)) for modulus in moduli],
+                       dtype=np.int64)[inverse]
+    if n.dtype == object:
+        reduced = np.array([int(value) % int(period)
+                            for value, period in zip(n, periods)],
+                           dtype=np.int64)
+    else:
+        reduced = n.astype(np.int64) % periods
+
+    # Fast doubling on (fib(k), fib(k + 1)), one bit of every n at a time
+    a = np.zeros(reduced.size, dtype=np.int64)
+    b = np.ones(reduced.size, dtype=np.int64) % m
+    bits = int(reduced.max()).bit_length() if reduced.size else 0
+    for shift in range(bits - 1, -1, -1):
+        c = a * ((2 * b - a) % m) % m
+        d = (a * a + b * b) % m
+        odd = (reduced >> shift) & 1 == 1
+        a = np.where(odd, d, c)
+        b = np.where(odd, (c + d) % m, d)
+    return a.reshape(shape)
+
+if __name__ == "__main__":
+    import random
+    import time
+    rng = np.random.default_rng(0)
+    count = 10**6
+    n = rng.integers(0, 10**18, size=count)
+    # A thousand distinct moduli, so most Pisano periods come from the cache
+    m = rng.choice(rng.integers(1, MAX_MODULUS, size=1000), size=count)
+
+    tic = time.perf_counter()
+    batched = fib_mod(n, m)
+    toc = time.perf_counter()
+    print("fib_mod:       {} pairs in {:.3f} s".format(count, toc - tic))
+
+    sample = random.Random(0).sample(range(count), 1000)
+    tic = time.perf_counter()
+    for i in sample:
+        assert fast_doubling(int(n[i]), int(m[i])) == batched[i]
+    toc = time.perf_counter()
+    print("fast_doubling: {} pairs in {:.3f} s".format(len(sample), toc - tic))
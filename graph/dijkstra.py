@@ -8,7 +8,7 @@ sys.path.append('..')
 sys.path.append('../..')
 
 from graph import WeightedGraph
-from data_structures import PriorityQueue
+from data_structures import PriorityQueue, IndexedPriorityQueue
 
 class DijkstraNode(object):
     """
@@ -23,9 +23,9 @@ class DijkstraNode(object):
         return self.distance == other.distance
 
     def __lt__(self, other):
-        self.distance < other.distance
+        return self.distance < other.distance
 
-def dijkstra(weighted_graph, root_vertex):
+def dijkstra(weighted_graph, root_vertex, node_queue=None):
     """
     Dijkstra's algorithm for computing the path with the minimum weight from
     root_vertex to every other vertex in a weighted graph.
@@ -36,6 +36,12 @@ def dijkstra(weighted_graph, root_vertex):
         Weighted graph over which search will be conducted.
     root_vertex : Generic
         Vertex in weighted_graph from which paths will originate.
+    node_queue : PriorityQueue, optional
+        Empty queue used to order the vertices to visit. The default
+        PriorityQueue pushes a new DijkstraNode every time a vertex distance
+        improves. An IndexedPriorityQueue keyed on the vertex index
+        (``IndexedPriorityQueue(key=lambda n: n.vertex)``) updates the queued
+        node in place with decrease_key instead.
 
     Returns
     -------
@@ -53,7 +59,9 @@ def dijkstra(weighted_graph, root_vertex):
     # Initialize mapping of vertices to their min paths
     path_dict = {}
     # Initialize search queue
-    node_queue = PriorityQueue()
+    if node_queue is None:
+        node_queue = PriorityQueue()
+    indexed = isinstance(node_queue, IndexedPriorityQueue)
     node_queue.push(DijkstraNode(first, 0))
 
     while not node_queue.empty:
@@ -70,7 +78,10 @@ def dijkstra(weighted_graph, root_vertex):
                 # Update edge on shortest path to this vertex
                 path_dict[we.v] = we
                 # Explore it soon
-                node_queue.push(DijkstraNode(we.v, dist_u + we.weight))
+                if indexed and we.v in node_queue:
+                    node_queue.decrease_key(DijkstraNode(we.v, dist_u + we.weight))
+                else:
+                    node_queue.push(DijkstraNode(we.v, dist_u + we.weight))
     return distances, path_dict
 
 def distances_to_vertex_dict(weighted_graph, distances):
@@ -18,6 +18,9 @@ class UndirectedGraph(object):
         # List of list of edges, where each entry in _edges represents a
         # list of connections (edges) with other vertices
         self._edges = [[] for v in vertices]
+        # Union-find forest over vertex indices labelling the connected
+        # components, kept up to date as vertices and edges are added
+        self._component_parent = list(range(len(vertices)))
 
     def __str__(self):
         out = ""
@@ -40,6 +43,7 @@ class UndirectedGraph(object):
         """
         self._vertices.append(vertex)
         self._edges.append([])
+        self._component_parent.append(self.vertex_count - 1)
         return self.vertex_count - 1
 
     def add_edge(self, edge):
@@ -48,6 +52,11 @@ class UndirectedGraph(object):
         """
         self._edges[edge.u].append(edge)
         self._edges[edge.v].append(edge.reversed())
+        # Merge the components of the two vertices
+        u = self.component_for_index(edge.u)
+        v = self.component_for_index(edge.v)
+        if u != v:
+            self._component_parent[max(u, v)] = min(u, v)
 
     def add_edge_by_indices(self, u, v):
         """
@@ -77,6 +86,33 @@ class UndirectedGraph(object):
         """
         return self._vertices.index(vertex)
 
+    def component_for_index(self, index):
+        """
+        Return a label for the connected component of the vertex at given
+        index. Two vertices are connected iff their labels are equal; labels
+        may change as edges are added.
+        """
+        parent = self._component_parent
+        while parent[index] != index:
+            # Path halving
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def component_for_vertex(self, vertex):
+        """
+        Return a label for the connected component of given vertex.
+        """
+        return self.component_for_index(self.index_of(vertex))
+
+    def connected(self, vert1, vert2):
+        """
+        Test whether there is a path between two vertices, in near-constant
+        time.
+        """
+        return (self.component_for_vertex(vert1) ==
+                self.component_for_vertex(vert2))
+
     def neighbors_for_index(self, index):
         """
         Return all vertices connected to vertex at given index.
@@ -0,0 +1,161 @@
+"""
+Layer-synchronous breadth-first search over NumPy occupancy grids.
+
+Rather than calling a successor function for one state at a time, the whole
+BFS frontier is held as an array of flat cell indices and every layer is
+expanded at once with array arithmetic and boolean masks.
+"""
+import numpy as np
+
+from maze import MazeLocation
+
+def _padded(blocked):
+    """
+    Flatten a blocked grid surrounded by a wall, so that moves never need
+    bounds checks.
+
+    Returns
+    -------
+    closed : np.ndarray
+        Flat boolean copy of the padded grid, True for walls and blocked
+        cells.
+    width : int
+        Row length of the padded grid; cell (row, col) of the original grid
+        is at flat index (row + 1) * width + col + 1.
+    moves : np.ndarray
+        Flat index offsets for left, right, up and down moves.
+    """
+    nrows, ncols = blocked.shape
+    width = ncols + 2
+    closed = np.ones((nrows + 2, width), dtype=bool)
+    closed[1:-1, 1:-1] = blocked
+    moves = np.array([-1, 1, -width, width], dtype=np.int64)
+    return closed.ravel(), width, moves
+
+def grid_bfs(blocked, start, goal):
+    """
+    Breadth-first search on a 2D grid with cardinal moves.
+
+    Neighbors are generated in the same order as Maze.possible_next_locations
+    (left, right, up, down) and each newly reached cell keeps the first
+    frontier cell that reached it as its parent, so the returned path is the
+    same one that node_to_path gives for search.bfs.
+
+    Parameters
+    ----------
+    blocked : np.ndarray
+        Boolean array of shape (nrows, ncols), True where moves are not
+        allowed.
+    start : MazeLocation
+        Starting cell.
+    goal : MazeLocation
+        Goal cell.
+
+    Returns
+    -------
+    path : List[MazeLocation]
+        Cells from start to goal (inclusive). Returns None if the goal cannot
+        be reached.
+    """
+    closed, width, moves = _padded(blocked)
+    start_index = (start.row + 1) * width + start.col + 1
+    goal_index = (goal.row + 1) * width + goal.col + 1
+    if start_index == goal_index:
+        return [start]
+    # Cells that may no longer be entered: walls plus everything reached
+    closed[start_index] = True
+    parent = np.full(closed.size, -1, dtype=np.int64)
+    frontier = np.array([start_index], dtype=np.int64)
+    while frontier.size:
+        # Candidate moves for every frontier cell, one column per direction.
+        # Row-major order of (frontier cell, direction) is the FIFO order in
+        # which search.bfs would discover these cells.
+        candidates = frontier[:, None] + moves
+        open_move = ~closed[candidates]
+        children = candidates[open_move]
+        parents = np.broadcast_to(frontier[:, None], candidates.shape)[open_move]
+        # Keep only the first discovery of each cell, in discovery order
+        _, first = np.unique(children, return_index=True)
+        first.sort()
+        frontier = children[first]
+        parent[frontier] = parents[first]
+        closed[frontier] = True
+        if parent[goal_index] >= 0:
+            return _index_path(parent, goal_index, width)
+    # Search terminates without finding goal
+    return None
+
+def _index_path(parent, goal_index, width):
+    """
+    Follow parent indices back from the goal and convert them to a path of
+    locations on the unpadded grid.
+    """
+    indices = [goal_index]
+    while parent[indices[-1]] >= 0:
+        indices.append(int(parent[indices[-1]]))
+    indices.reverse()
+    return [MazeLocation(i // width - 1, i % width - 1) for i in indices]
+
+def distance_field(blocked, goal):
+    """
+    Breadth-first search outward from the goal, recording the number of moves
+    from every cell to the goal.
+
+    Parameters
+    ----------
+    blocked : np.ndarray
+        Boolean array of shape (nrows, ncols), True where moves are not
+        allowed.
+    goal : MazeLocation
+        Goal cell.
+
+    Returns
+    -------
+    distance : np.ndarray
+        int32 array of shape (nrows, ncols) holding the length of the
+        shortest path from each cell to the goal, or -1 where the goal cannot
+        be reached (including blocked cells).
+    """
+    nrows, ncols = blocked.shape
+    closed, width, moves = _padded(blocked)
+    distance = np.full(closed.size, -1, dtype=np.int32)
+
+    frontier = np.array([(goal.row + 1) * width + goal.col + 1],
+                        dtype=np.int64)
+    if closed[frontier[0]]:
+        frontier = frontier[:0]
+    closed[frontier] = True
+    layer = 0
+    while frontier.size:
+        distance[frontier] = layer
+        candidates = (frontier[:, None] + moves).ravel()
+        frontier = np.unique(candidates[~closed[candidates]])
+        closed[frontier] = True
+        layer += 1
+    return distance.reshape(nrows + 2, width)[1:-1, 1:-1].copy()
+
+def maze_bfs(maze):
+    """
+    Solve a maze.Maze from its start to its goal with grid_bfs.
+    """
+    return grid_bfs(maze.blocked_mask(), maze.start, maze.goal)
+
+if __name__ == "__main__":
+    import random
+    import time
+    from maze import Maze
+    from search import bfs, node_to_path
+    random.seed(0)
+    for n in (100, 300, 1000):
+        m = Maze(n, n, start=MazeLocation(0, 0), end=MazeLocation(n - 1, n - 1))
+        blocked = m.blocked_mask()
+        tic = time.perf_counter()
+        path = grid_bfs(blocked, m.start, m.goal)
+        toc = time.perf_counter()
+        print("{0}x{0} grid_bfs: {1:.4f} s".format(n, toc - tic))
+        tic = time.perf_counter()
+        solution = bfs(m.start, m.goal_test, m.possible_next_locations)
+        toc = time.perf_counter()
+        print("{0}x{0} bfs:      {1:.4f} s".format(n, toc - tic))
+        expected = None if solution is None else node_to_path(solution)
+        print("  same path: {}".format(path == expected))
@@ -0,0 +1,266 @@
+"""
+Hierarchical pathfinding (HPA*) on a maze.
+
+The grid is split into square clusters. Wherever two neighboring clusters
+share a run of open cells along their border (an entrance), one or two pairs
+of cells across the border become nodes of an abstract graph, and every pair
+of nodes in the same cluster is joined by an edge weighted with their
+distance inside the cluster. A query searches this small graph instead of
+the grid and then refines only the chosen edges back into cells.
+
+Paths are near-optimal rather than optimal: they must pass through the
+chosen entrance cells. See Botea, Mueller and Schaeffer, "Near Optimal
+Hierarchical Path-Finding", Journal of Game Development 1 (2004).
+"""
+from collections import deque
+from heapq import heappush, heappop
+from itertools import count
+
+from maze import MazeLocation
+
+class HPAStar(object):
+    """
+    Near-optimal path planner for a maze.Maze over an abstract graph of
+    cluster entrances.
+
+    Usage::
+
+        planner = HPAStar(maze, cluster_size=16)
+        path = planner.plan()
+        path = planner.plan(start, goal)
+
+    The abstract graph is rebuilt on the next query after the maze changes.
+    """
+    def __init__(self, maze, cluster_size=10):
+        """
+        Parameters
+        ----------
+        maze : maze.Maze
+            Maze to plan on.
+        cluster_size : int
+            Side length of the square clusters, in cells.
+        """
+        self._maze = maze
+        self.cluster_size = cluster_size
+        # Number of abstract nodes expanded by the last call to plan()
+        self.expanded = 0
+        self._build()
+
+    @property
+    def node_count(self):
+        return len(self._edges)
+
+    @property
+    def edge_count(self):
+        return sum(map(len, self._edges.values()))
+
+    def _build(self):
+        """
+        Find the entrances between clusters and the distances between them
+        inside every cluster.
+        """
+        maze, size = self._maze, self.cluster_size
+        self._version = maze.version
+        self._blocked = maze.blocked_mask().tolist()
+        nrows, ncols = maze.nrows, maze.ncols
+        # Abstract node (row, col) -> {neighbor node : cost}
+        self._edges = {}
+        # Cluster (row, col) -> abstract nodes inside it
+        self._cluster_nodes = {}
+        for top in range(0, nrows, size):
+            for left in range(0, ncols, size):
+                bottom = min(top + size, nrows)
+                right = min(left + size, ncols)
+                # Border with the cluster to the right
+                if right < ncols:
+                    self._add_entrances([((r, right - 1), (r, right))
+                                         for r in range(top, bottom)])
+                # Border with the cluster below
+                if bottom < nrows:
+                    self._add_entrances([((bottom - 1, c), (bottom, c))
+                                         for c in range(left, right)])
+        for cluster, nodes in self._cluster_nodes.items():
+            self._connect_cluster(cluster, nodes)
+
+    def _connect_cluster(self, cluster, nodes):
+        """
+        Join every pair of abstract nodes in a cluster with an edge weighted
+        by their distance inside the cluster.
+        """
+        size = self.cluster_size
+        top, left = cluster[0] * size, cluster[1] * size
+        bottom = min(top + size, self._maze.nrows)
+        right = min(left + size, self._maze.ncols)
+        width = right - left
+        # Breadth-first search on flat indices into the cluster, which is
+        # much faster than on cells when repeated for every node
+        open_cells = [not cell for row in self._blocked[top:bottom]
+                      for cell in row[left:right]]
+        local = [(r - top) * width + c - left for r, c in nodes]
+        for node, source in zip(nodes, local):
+            distance = [-1] * len(open_cells)
+            distance[source] = 0
+            frontier = deque([source])
+            while frontier:
+                index = frontier.popleft()
+                step = distance[index] + 1
+                col = index % width
+                for child, inside in ((index - 1, col > 0),
+                                      (index + 1, col + 1 < width),
+                                      (index - width, index >= width),
+                                      (index + width,
+                                       index + width < len(open_cells))):
+                    if inside and open_cells[child] and distance[child] < 0:
+                        distance[child] = step
+                        frontier.append(child)
+            edges = self._edges[node]
+            for other, target in zip(nodes, local):
+                if other != node and distance[target] >= 0:
+                    edges[other] = distance[target]
+
+    def _add_entrances(self, pairs):
+        """
+        Add abstract nodes for the entrances along one cluster border, given
+        as the pairs of cells facing each other across it.
+        """
+        blocked = self._blocked
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and not any(blocked[r][c] for r, c in pair):
+                run.append(pair)
+                continue
+            if run:
+                # Short entrances get one transition in the middle, long
+                # ones one at each end
+                if len(run) < 6:
+                    transitions = [run[len(run) // 2]]
+                else:
+                    transitions = [run[0], run[-1]]
+                for a, b in transitions:
+                    self._add_node(a)[b] = 1
+                    self._add_node(b)[a] = 1
+                run = []
+
+    def _add_node(self, cell):
+        if cell not in self._edges:
+            self._edges[cell] = {}
+            self._cluster_nodes.setdefault(self._cluster_of(cell),
+                                           []).append(cell)
+        return self._edges[cell]
+
+    def _cluster_of(self, cell):
+        return (cell[0] // self.cluster_size, cell[1] // self.cluster_size)
+
+    def _cluster_bfs(self, source, target=None):
+        """
+        Breadth-first search from source that never leaves its cluster.
+
+        Returns the distance to every reachable cell of the cluster, or, if
+        target is given, the path to it (None if it cannot be reached).
+        """
+        blocked, size = self._blocked, self.cluster_size
+        cluster = self._cluster_of(source)
+        top, left = cluster[0] * size, cluster[1] * size
+        bottom = min(top + size, self._maze.nrows)
+        right = min(left + size, self._maze.ncols)
+        parent = {source : None}
+        distance = {source : 0}
+        frontier = deque([source])
+        while frontier:
+            cell = frontier.popleft()
+            if cell == target:
+                path = []
+                while cell is not None:
+                    path.append(MazeLocation(*cell))
+                    cell = parent[cell]
+                path.reverse()
+                return path
+            r, c = cell
+            for child in ((r, c - 1), (r, c + 1), (r - 1, c), (r + 1, c)):
+                if (top <= child[0] < bottom and left <= child[1] < right and
+                        child not in parent and
+                        not blocked[child[0]][child[1]]):
+                    parent[child] = cell
+                    distance[child] = distance[cell] + 1
+                    frontier.append(child)
+        return None if target is not None else distance
+
+    def plan(self, start=None, goal=None):
+        """
+        Find a near-optimal path from start to goal.
+
+        Parameters
+        ----------
+        start, goal : MazeLocation, optional
+            Ends of the path. Default to the start and goal of the maze.
+
+        Returns
+        -------
+        path : List[MazeLocation]
+            Locations from start to goal, or None if the goal is unreachable.
+        """
+        if self._maze.version != self._version:
+            self._build()
+        start = tuple(self._maze.start if start is None else start)
+        goal = tuple(self._maze.goal if goal is None else goal)
+        self.expanded = 0
+        blocked = self._blocked
+        if blocked[start[0]][start[1]] or blocked[goal[0]][goal[1]]:
+            return None
+        # Temporary edges connecting start and goal to their clusters
+        extra = {start : {}, goal : {}}
+        for node, distance in self._cluster_bfs(start).items():
+            if node in self._edges or node == goal:
+                extra[start][node] = distance
+        for node, distance in self._cluster_bfs(goal).items():
+            if node in self._edges and node != goal:
+                extra.setdefault(node, {})[goal] = distance
+
+        # A* over the abstract graph
+        def estimate(cell):
+            return abs(cell[0] - goal[0]) + abs(cell[1] - goal[1])
+
+        tie = count()
+        cost_to = {start : 0}
+        parent_of = {start : None}
+        closed = set()
+        frontier = [(estimate(start), next(tie), start)]
+        while frontier:
+            _, _, node = heappop(frontier)
+            if node in closed:
+                continue
+            if node == goal:
+                return self._refine(node, parent_of)
+            closed.add(node)
+            self.expanded += 1
+            g = cost_to[node]
+            for edges in (self._edges.get(node, {}), extra.get(node, {})):
+                for neighbor, weight in edges.items():
+                    new_cost = g + weight
+                    if (neighbor not in closed and
+                            new_cost < cost_to.get(neighbor, float("inf"))):
+                        cost_to[neighbor] = new_cost
+                        parent_of[neighbor] = node
+                        heappush(frontier, (new_cost + estimate(neighbor),
+                                            next(tie), neighbor))
+        # Search terminates without finding goal
+        return None
+
+    def _refine(self, node, parent_of):
+        """
+        Turn the chain of abstract nodes ending at node into the full list of
+        cells, searching inside one cluster for every intra-cluster edge.
+        """
+        nodes = []
+        while node is not None:
+            nodes.append(node)
+            node = parent_of[node]
+        nodes.reverse()
+        path = [MazeLocation(*nodes[0])]
+        for a, b in zip(nodes, nodes[1:]):
+            if self._cluster_of(a) != self._cluster_of(b):
+                # Step across a cluster border
+                path.append(MazeLocation(*b))
+            else:
+                path.extend(self._cluster_bfs(a, target=b)[1:])
+        return path
@@ -0,0 +1,150 @@
+"""
+Jump Point Search (JPS) for uniform-cost mazes with cardinal moves.
+
+A* on a uniform grid wastes most of its effort on symmetric paths: the many
+equally short orderings of the same horizontal and vertical steps. JPS only
+places search nodes at "jump points" where the shape of the surrounding walls
+can force a turn, and jumps along straight lines between them. The rules for
+4-connected grids follow the non-diagonal variant of PathFinding.js: every
+horizontal step keeps both vertical turns open, and a vertical jump stops
+wherever a horizontal jump would find a jump point.
+"""
+from heapq import heappush, heappop
+from itertools import count
+
+from maze import MazeLocation
+
+def jps(blocked, start, goal, expanded=None):
+    """
+    Jump Point Search from start to goal on a grid with cardinal moves of
+    unit cost.
+
+    Parameters
+    ----------
+    blocked : Sequence[Sequence[bool]]
+        Row-major grid (list of lists or 2D array) that is True where moves
+        are not allowed.
+    start : MazeLocation
+        Starting cell.
+    goal : MazeLocation
+        Goal cell.
+    expanded : list, optional
+        If given, every jump point expanded during the search is appended to
+        it, for diagnostics.
+
+    Returns
+    -------
+    path : List[MazeLocation]
+        Every cell from start to goal (inclusive), suitable for
+        Maze.mark_path. Returns None if the goal cannot be reached.
+    """
+    nrows, ncols = len(blocked), len(blocked[0])
+    # Grid of open cells surrounded by a wall, so moves need no bounds checks
+    walkable = [[False] * (ncols + 2)]
+    for row in blocked:
+        walkable.append([False] + [not cell for cell in row] + [False])
+    walkable.append([False] * (ncols + 2))
+    start_cell = (start.row + 1, start.col + 1)
+    goal_cell = (goal.row + 1, goal.col + 1)
+    goal_row, goal_col = goal_cell
+
+    def jump(r, c, dr, dc):
+        """
+        Move from (r, c) in direction (dr, dc) until reaching a jump point
+        (returned as a cell) or a wall (returns None).
+        """
+        while walkable[r][c]:
+            if r == goal_row and c == goal_col:
+                return (r, c)
+            if dc:
+                # A wall ending behind us opens a vertical turn here
+                if ((walkable[r - 1][c] and not walkable[r - 1][c - dc]) or
+                        (walkable[r + 1][c] and not walkable[r + 1][c - dc])):
+                    return (r, c)
+            else:
+                if ((walkable[r][c - 1] and not walkable[r - dr][c - 1]) or
+                        (walkable[r][c + 1] and not walkable[r - dr][c + 1])):
+                    return (r, c)
+                # Stop where a horizontal jump would find a jump point
+                if (jump(r, c + 1, 0, 1) is not None or
+                        jump(r, c - 1, 0, -1) is not None):
+                    return (r, c)
+            r += dr
+            c += dc
+        return None
+
+    def directions(cell, parent):
+        """
+        Directions worth jumping in from cell, given the jump point it was
+        reached from.
+        """
+        if parent is None:
+            return ((0, -1), (0, 1), (-1, 0), (1, 0))
+        r, c = cell
+        dr = (r > parent[0]) - (r < parent[0])
+        dc = (c > parent[1]) - (c < parent[1])
+        if dc:
+            # Keep going horizontally, or turn up or down
+            return ((0, dc), (-1, 0), (1, 0))
+        # Keep going vertically, or turn left or right
+        return ((dr, 0), (0, -1), (0, 1))
+
+    def estimate(cell):
+        return abs(cell[0] - goal_row) + abs(cell[1] - goal_col)
+
+    if not walkable[start_cell[0]][start_cell[1]]:
+        return None
+    # A* over jump points
+    tie = count()
+    cost_to = {start_cell : 0}
+    parent_of = {start_cell : None}
+    closed = set()
+    frontier = [(estimate(start_cell), next(tie), start_cell)]
+    while frontier:
+        _, _, cell = heappop(frontier)
+        if cell in closed:
+            continue
+        if cell == goal_cell:
+            return _expand_path(cell, parent_of)
+        closed.add(cell)
+        if expanded is not None:
+            expanded.append(MazeLocation(cell[0] - 1, cell[1] - 1))
+        g = cost_to[cell]
+        for dr, dc in directions(cell, parent_of[cell]):
+            point = jump(cell[0] + dr, cell[1] + dc, dr, dc)
+            if point is None or point in closed:
+                continue
+            new_cost = g + abs(point[0] - cell[0]) + abs(point[1] - cell[1])
+            if point not in cost_to or new_cost < cost_to[point]:
+                cost_to[point] = new_cost
+                parent_of[point] = cell
+                heappush(frontier, (new_cost + estimate(point), next(tie),
+                                    point))
+    # Search terminates without finding goal
+    return None
+
+def _expand_path(cell, parent_of):
+    """
+    Turn the chain of jump points ending at cell into the full list of cells
+    (on the unpadded grid) from start to goal.
+    """
+    path = [MazeLocation(cell[0] - 1, cell[1] - 1)]
+    parent = parent_of[cell]
+    while parent is not None:
+        dr = (parent[0] > cell[0]) - (parent[0] < cell[0])
+        dc = (parent[1] > cell[1]) - (parent[1] < cell[1])
+        r, c = cell
+        while (r, c) != parent:
+            r += dr
+            c += dc
+            path.append(MazeLocation(r - 1, c - 1))
+        cell, parent = parent, parent_of[parent]
+    path.reverse()
+    return path
+
+def maze_jps(maze, expanded=None):
+    """
+    Solve a maze.Maze from its start to its goal with jps.
+    """
+    return jps(maze.blocked_mask().tolist(), maze.start, maze.goal,
+               expanded=expanded)
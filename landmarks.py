@@ -0,0 +1,234 @@
+"""
+Landmark (ALT) heuristics for A*.
+
+A handful of landmark states is chosen and the shortest distance from every
+landmark to every state is computed once. By the triangle inequality, the
+distance between any two states a and b is at least |d(L, b) - d(L, a)| for
+every landmark L, and the largest of these bounds is an admissible and
+consistent heuristic. It is much tighter than the manhattan distance on
+grids with many obstacles, and works on graphs that have no geometry at all.
+
+See Goldberg and Harrelson, "Computing the Shortest Path: A* Search Meets
+Graph Theory", SODA 2005.
+"""
+import random
+
+import numpy as np
+
+from grid_search import distance_field
+from maze import MazeLocation
+
+class Landmarks(object):
+    """
+    Landmarks with a table of distances from each landmark to every state.
+
+    Build one with maze_landmarks or graph_landmarks.
+    """
+    def __init__(self, landmarks, tables, index):
+        """
+        Parameters
+        ----------
+        landmarks : list
+            The landmark states.
+        tables : np.ndarray
+            Array of shape (len(landmarks), number of states) holding the
+            distance from each landmark to each state, and -1 (for integer
+            tables) or inf where a state cannot be reached.
+        index : Callable
+            Callable mapping a state onto its column in tables.
+        """
+        self.landmarks = landmarks
+        self.tables = tables
+        self._index = index
+
+    @property
+    def nbytes(self):
+        """
+        Size of the distance tables in bytes.
+        """
+        return self.tables.nbytes
+
+    def heuristic(self, goal, fallback=None):
+        """
+        Return a callable that bounds the distance from an input state to
+        goal from below, for use as the heuristic of search.a_star.
+
+        With few landmarks the bound can be weaker than a geometric one in
+        places. Pass that heuristic (for goal) as fallback, e.g.
+        ``maze.manhattan_distance(goal)``, to use the larger of the two,
+        which is still admissible and consistent.
+        """
+        column = self._index(goal)
+        index = self._index
+        # Landmarks that cannot reach the goal give no bound
+        pairs = [(float(distance), memoryview(table))
+                 for distance, table in zip(self.tables[:, column],
+                                            self.tables)
+                 if np.isfinite(distance) and distance >= 0]
+        def distance(state):
+            i = index(state)
+            return max([abs(to_goal - table[i]) for to_goal, table in pairs],
+                       default=0)
+        if fallback is None:
+            return distance
+        def combined(state):
+            return max(distance(state), fallback(state))
+        return combined
+
+def _check_count(count, candidates):
+    if not 0 < count <= len(candidates):
+        raise ValueError("Cannot choose {} landmarks among {} reachable "
+                         "states".format(count, len(candidates)))
+
+def _farthest(tables, candidates, rng):
+    """
+    Candidate state farthest from the landmarks already chosen (from a random
+    candidate if there are none yet), given the tables of the chosen ones.
+    """
+    if not tables:
+        return rng.choice(candidates)
+    # Distance to the nearest chosen landmark
+    nearest = np.min(np.stack([table[candidates] for table in tables]),
+                     axis=0)
+    return candidates[int(np.argmax(nearest))]
+
+def maze_landmarks(maze, count=8, strategy="farthest", seed=None):
+    """
+    Choose landmarks on a maze.Maze and compute their distance tables.
+
+    Parameters
+    ----------
+    maze : maze.Maze
+        Maze to route on, with unit cost moves (maze.grid_cost).
+    count : int
+        Number of landmarks, at most the number of reachable cells. Every
+        landmark costs 4 bytes per cell.
+    strategy : {"farthest", "perimeter", "random"}
+        How to choose landmarks among the cells reachable from the start of
+        the maze:
+
+        - "farthest": start from a random cell and repeatedly add the cell
+          whose distance to the nearest landmark so far is largest. Tends to
+          put landmarks at the ends of long corridors and on the edges.
+        - "perimeter": the reachable cells closest to count points spread
+          evenly along the border of the maze.
+        - "random": uniformly random cells.
+    seed : int, optional
+        Seed for the random choices.
+
+    Returns
+    -------
+    landmarks : Landmarks
+        Heuristic source for any goal on the maze. The tables go stale if
+        cells are blocked or unblocked afterwards.
+    """
+    rng = random.Random(seed)
+    nrows, ncols = maze.nrows, maze.ncols
+    blocked = maze.blocked_mask()
+    reachable = np.flatnonzero(distance_field(blocked, maze.start) >= 0)
+    candidates = reachable.tolist()
+    _check_count(count, candidates)
+
+    def location(index):
+        return MazeLocation(*divmod(int(index), ncols))
+
+    tables = []
+    if strategy == "farthest":
+        chosen = []
+        for _ in range(count):
+            loc = location(_farthest(tables, candidates, rng))
+            chosen.append(loc)
+            tables.append(distance_field(blocked, loc).reshape(-1))
+    else:
+        if strategy == "perimeter":
+            perimeter = 2 * (nrows + ncols - 2)
+            rows, cols = np.divmod(reachable, ncols)
+            chosen = []
+            for k in range(count):
+                r, c = _border_cell(k * perimeter // count, nrows, ncols)
+                nearest = np.argmin((rows - r) ** 2 + (cols - c) ** 2)
+                chosen.append(location(reachable[nearest]))
+        elif strategy == "random":
+            chosen = [location(i) for i in rng.sample(candidates, count)]
+        else:
+            raise ValueError("Unknown landmark strategy {}".format(strategy))
+        tables = [distance_field(blocked, loc).reshape(-1) for loc in chosen]
+    return Landmarks(chosen, np.stack(tables), maze.location_index)
+
+def _border_cell(step, nrows, ncols):
+    """
+    Cell reached after step moves clockwise along the border of the grid,
+    starting from the top left corner.
+    """
+    width, height = ncols - 1, nrows - 1
+    if step < width:
+        return (0, step)
+    step -= width
+    if step < height:
+        return (step, ncols - 1)
+    step -= height
+    if step < width:
+        return (nrows - 1, ncols - 1 - step)
+    step -= width
+    return (max(nrows - 1 - step, 0), 0)
+
+def _graph_distances(weighted_graph, source):
+    """
+    Distance from the vertex at index source to every vertex index (inf if
+    unreachable).
+    """
+    # The graph modules import each other by plain module name, so this only
+    # resolves with the graph directory on sys.path, as it is wherever a
+    # WeightedGraph was built
+    from dijkstra import dijkstra
+    distances, _ = dijkstra(weighted_graph, weighted_graph.vertex_at(source))
+    return np.array([float("inf") if distance is None else distance
+                     for distance in distances])
+
+def graph_landmarks(weighted_graph, count=8, strategy="farthest", seed=None):
+    """
+    Choose landmark vertices on a graph.WeightedGraph and compute their
+    distance tables.
+
+    Parameters
+    ----------
+    weighted_graph : graph.WeightedGraph
+        Graph to route on, with non-negative edge weights.
+    count : int
+        Number of landmarks, at most the number of reachable vertices. Every
+        landmark costs 8 bytes per vertex.
+    strategy : {"farthest", "random"}
+        How to choose landmarks among the vertices reachable from the first
+        vertex of the graph: repeatedly the vertex farthest from the
+        landmarks so far, or uniformly random vertices (see maze_landmarks).
+    seed : int, optional
+        Seed for the random choices.
+
+    Returns
+    -------
+    landmarks : Landmarks
+        Heuristic source for any goal vertex. The tables go stale if edges
+        are added afterwards.
+    """
+    rng = random.Random(seed)
+    reachable = np.flatnonzero(np.isfinite(_graph_distances(weighted_graph,
+                                                            0)))
+    candidates = reachable.tolist()
+    _check_count(count, candidates)
+    tables = []
+    if strategy == "farthest":
+        chosen = []
+        for _ in range(count):
+            index = _farthest(tables, candidates, rng)
+            chosen.append(index)
+            tables.append(_graph_distances(weighted_graph, index))
+    elif strategy == "random":
+        chosen = rng.sample(candidates, count)
+        tables = [_graph_distances(weighted_graph, index) for index in chosen]
+    else:
+        raise ValueError("Unknown landmark strategy {}".format(strategy))
+    # Look up vertex indices in a dict, as index_of scans the vertex list
+    indices = {weighted_graph.vertex_at(i) : i
+               for i in range(weighted_graph.vertex_count)}
+    return Landmarks([weighted_graph.vertex_at(i) for i in chosen],
+                     np.stack(tables), indices.__getitem__)
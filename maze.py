@@ -1,12 +1,18 @@
 """
-Solving mazes with generic search (without numpy)
+Solving mazes with generic search
 
 See 'Classic Computer Science Problems in Python', Ch. 2
 """
 from enum import Enum
-from collections import namedtuple
+from collections import deque, namedtuple
 import random
 from math import sqrt
+import os
+import shutil
+import struct
+import tempfile
+
+import numpy as np
 
 class Cell(str, Enum):
     empty =   " "
@@ -15,6 +21,19 @@ class Cell(str, Enum):
     goal =    "G"
     path =    "*"
 
+# Cells are stored as their position in this tuple, one byte per cell
+_CELLS = (Cell.empty, Cell.blocked, Cell.start, Cell.goal, Cell.path)
+_EMPTY, _BLOCKED, _START, _GOAL, _PATH = range(len(_CELLS))
+# Character to render for each stored value
+_GLYPHS = np.array([ord(cell.value) for cell in _CELLS], dtype=np.uint8)
+
+# On-disk format: a 64 byte header (magic, format version, nrows, ncols,
+# start row and col, goal row and col, number of blocked cells) followed by
+# the grid, one byte per cell in row-major order
+_MAGIC = b"MAZE"
+_VERSION = 1
+_HEADER = struct.Struct("<4sI7Q")
+
 MazeLocation = namedtuple("MazeLocation", ("row", "col"))
 
 def euclidean_distance(goal):
@@ -48,37 +67,218 @@ def grid_cost(current_node):
 class Maze(object):
     """
     2D grid maze
+
+    The grid is a (nrows, ncols) uint8 NumPy array holding one byte per cell,
+    so large mazes can be filled, rendered and cleared with array operations.
     """
     def __init__(self, nrows=10, ncols=10, blocked_fraction=0.2,
-                 start=MazeLocation(0, 0), end=MazeLocation(9, 9)):
+                 start=MazeLocation(0, 0), end=MazeLocation(9, 9), seed=None):
+        """
+        Parameters
+        ----------
+        nrows, ncols : int
+            Size of the grid.
+        blocked_fraction : float
+            Probability that each cell is blocked.
+        start, end : MazeLocation
+            Start and goal of the maze. They are never blocked.
+        seed : int or numpy.random.Generator, optional
+            Seed for the random fill. By default the seed is drawn from the
+            random module, so ``random.seed`` still makes mazes reproducible.
+        """
         self._nrows = nrows
         self._ncols = ncols
-        self._blocked_cells = 0
         self.start = start
         self.goal = end
         # Initialize grid
-        self._grid = [[Cell.empty for c in range(self._ncols)] for r in range(self._nrows)]
+        self._grid = np.full((self._nrows, self._ncols), _EMPTY,
+                             dtype=np.uint8)
         # Randomly block
-        self._randomly_fill(blocked_fraction)
+        self._randomly_fill(blocked_fraction, seed)
         # Set start and end points
-        self._grid[start.row][start.col] = Cell.start
-        self._grid[end.row][end.col] = Cell.goal
+        self._grid[start.row, start.col] = _START
+        self._grid[end.row, end.col] = _GOAL
+        self._blocked_cells = int(np.count_nonzero(self._grid == _BLOCKED))
+        # Flat view of the grid for fast access to single cells
+        self._cells = memoryview(self._grid.reshape(-1))
+        # Connected component labels, computed on first use
+        self._labels = None
+        # Number of changes made to the grid by set_blocked
+        self._version = 0
+
+    @classmethod
+    def _from_grid(cls, grid, start, goal, blocked_cells):
+        """
+        Wrap an existing uint8 grid (e.g. a memory map) without copying it.
+        """
+        maze = cls.__new__(cls)
+        maze._nrows, maze._ncols = grid.shape
+        maze.start = start
+        maze.goal = goal
+        maze._grid = grid
+        maze._blocked_cells = blocked_cells
+        maze._cells = memoryview(grid.reshape(-1))
+        maze._labels = None
+        maze._version = 0
+        return maze
+
+    def __getstate__(self):
+        # Memoryviews cannot be pickled or copied; they are rebuilt from the
+        # arrays they view
+        state = self.__dict__.copy()
+        state.pop("_cells", None)
+        state.pop("_label_view", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cells = memoryview(self._grid.reshape(-1))
+        if self._labels is not None:
+            self._label_view = memoryview(self._labels)
+
+    def save(self, path):
+        """
+        Write the maze to a file in the binary maze format, which load can
+        memory-map. Marked paths are saved along with the maze.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            File to write. If it is the file the maze was loaded from, a
+            read-write map is flushed and only the header is rewritten in
+            place; otherwise the file is replaced by a new one, so that the
+            map is never read from while the file is truncated.
+        """
+        mapped = getattr(self._grid, "filename", None)
+        if (mapped is not None and os.path.exists(path) and
+                os.path.samefile(mapped, path)):
+            if self._grid.mode in ("r+", "w+"):
+                self._grid.flush()
+                with open(path, "r+b") as f:
+                    _write_header(f, self._nrows, self._ncols, self.start,
+                                  self.goal, self._blocked_cells)
+                return
+            fd, temporary = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(path)))
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    self._write(f)
+                shutil.copymode(path, temporary)
+                os.replace(temporary, path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+            return
+        with open(path, "wb") as f:
+            self._write(f)
+
+    def _write(self, f):
+        _write_header(f, self._nrows, self._ncols, self.start, self.goal,
+                      self._blocked_cells)
+        self._grid.tofile(f)
+
+    @classmethod
+    def load(cls, path, mode="r"):
+        """
+        Open a maze saved with save (or created with create_maze_file)
+        through a memory map.
+
+        Loading takes constant time whatever the size of the file: nothing is
+        read until a search touches a cell, and then the operating system
+        pages in only the parts of the grid around it.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            File to open.
+        mode : {"r", "r+", "c"}
+            Memory map mode, as for numpy.memmap: read-only, read-write (so
+            set_blocked and mark_path write through to the file, though the
+            blocked cell count in the header is only updated by saving the
+            maze to the same path), or copy-on-write (changes are kept in
+            memory only).
+
+        Returns
+        -------
+        maze : Maze
+            Maze backed by the file.
+        """
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError("{} is not a maze file".format(path))
+        (magic, version, nrows, ncols, start_row, start_col, goal_row,
+         goal_col, blocked_cells) = _HEADER.unpack(header)
+        if magic != _MAGIC:
+            raise ValueError("{} is not a maze file".format(path))
+        if version != _VERSION:
+            raise ValueError("Unsupported maze file version {}".format(
+                             version))
+        grid = np.memmap(path, dtype=np.uint8, mode=mode, offset=_HEADER.size,
+                         shape=(nrows, ncols))
+        return cls._from_grid(grid, MazeLocation(start_row, start_col),
+                              MazeLocation(goal_row, goal_col), blocked_cells)
 
     def __str__(self):
-        out = ''
-        for row in self._grid:
-            out += "".join([c.value for c in row]) + "\n"
-        return out
+        # Render every row followed by a newline in one lookup
+        out = np.empty((self._nrows, self._ncols + 1), dtype=np.uint8)
+        out[:, :-1] = _GLYPHS[self._grid]
+        out[:, -1] = ord("\n")
+        return out.tobytes().decode("ascii")
 
-    def _randomly_fill(self, blocked_fraction):
+    def _randomly_fill(self, blocked_fraction, seed=None):
         """
         Randomly fill maze with blocked locations.
         """
-        for row in range(self._nrows):
-            for col in range(self._ncols):
-                if random.uniform(0, 1.0) < blocked_fraction:
-                    self._grid[row][col] = Cell.blocked
-                    self._blocked_cells += 1
+        if seed is None:
+            seed = random.getrandbits(64)
+        rng = np.random.default_rng(seed)
+        blocked = rng.random((self._nrows, self._ncols)) < blocked_fraction
+        self._grid[blocked] = _BLOCKED
+
+    @property
+    def nrows(self):
+        return self._nrows
+
+    @property
+    def ncols(self):
+        return self._ncols
+
+    @property
+    def version(self):
+        """
+        Counter that goes up every time a cell is blocked or unblocked, so
+        that anything derived from the grid can tell when it is stale.
+        """
+        return self._version
+
+    def is_blocked(self, loc):
+        """
+        Test whether a location in the maze is blocked.
+        """
+        return self._cells[loc.row * self._ncols + loc.col] == _BLOCKED
+
+    def set_blocked(self, loc, blocked=True):
+        """
+        Block (or unblock) a location in the maze.
+
+        Raises a ValueError if loc is the start or the goal.
+        """
+        if loc == self.start or loc == self.goal:
+            raise ValueError("Cannot change the start or goal of the maze")
+        was_blocked = self.is_blocked(loc)
+        if blocked and not was_blocked:
+            self._grid[loc.row, loc.col] = _BLOCKED
+            self._blocked_cells += 1
+            self._version += 1
+            if self._labels is not None:
+                self._split_component(self.location_index(loc))
+        elif not blocked and was_blocked:
+            self._grid[loc.row, loc.col] = _EMPTY
+            self._blocked_cells -= 1
+            self._version += 1
+            if self._labels is not None:
+                self._join_components(self.location_index(loc))
 
     def goal_test(self, loc):
         """
@@ -86,6 +286,174 @@ class Maze(object):
         """
         return loc == self.goal
 
+    def location_index(self, loc):
+        """
+        Map a MazeLocation onto a unique integer in [0, nrows * ncols).
+        """
+        return loc.row * self._ncols + loc.col
+
+    def blocked_mask(self):
+        """
+        Return a boolean NumPy array of shape (nrows, ncols) that is True
+        wherever the maze is blocked.
+        """
+        return self._grid == _BLOCKED
+
+    def component(self, loc):
+        """
+        Label of the connected component of open cells containing loc, or
+        None if loc is blocked. Two cells are connected iff their labels are
+        equal.
+
+        Labels for the whole grid are computed on the first call (in
+        O(nrows * ncols) array operations) and then kept up to date by
+        set_blocked: unblocking a cell merges the components around it, and
+        blocking one searches outward from its neighbors to find out whether
+        it split its component, stopping as soon as the neighbors meet again.
+
+        The first call needs about 50 bytes of memory per cell, so it is not
+        meant for grids much larger than memory, such as a 100k x 100k
+        memory-mapped maze.
+        """
+        if self._labels is None:
+            self._label_components()
+        label = self._label_view[self.location_index(loc)]
+        return None if label < 0 else self._find_label(label)
+
+    def connected(self, loc1, loc2):
+        """
+        Test whether there is a path between two locations in the maze.
+        """
+        label = self.component(loc1)
+        return label is not None and label == self.component(loc2)
+
+    def goal_reachable(self, loc):
+        """
+        Test whether the goal can be reached from loc. Suitable as the
+        reachable argument of search.dfs, bfs and a_star, so that a maze with
+        a walled-off goal is rejected without searching it.
+        """
+        return self.connected(loc, self.goal)
+
+    def _label_components(self):
+        """
+        Label the connected components of open cells of the grid.
+        """
+        self._labels = _label_components(self._grid != _BLOCKED)
+        self._label_view = memoryview(self._labels)
+        # Union-find forest over labels, so that merging components does not
+        # relabel their cells
+        self._label_parent = list(range(int(self._labels.max()) + 1))
+
+    def _new_label(self):
+        """
+        Add a label to the union-find forest, widening the labels to int64
+        if they no longer fit.
+        """
+        label = len(self._label_parent)
+        self._label_parent.append(label)
+        if label > np.iinfo(self._labels.dtype).max:
+            self._labels = self._labels.astype(np.int64)
+            self._label_view = memoryview(self._labels)
+        return label
+
+    def _find_label(self, label):
+        parent = self._label_parent
+        while parent[label] != label:
+            # Path halving
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    def _open_neighbors(self, index):
+        """
+        Flat indices of the open cells next to the cell at index.
+        """
+        cells, ncols = self._cells, self._ncols
+        col = index % ncols
+        neighbors = []
+        if col > 0 and cells[index - 1] != _BLOCKED:
+            neighbors.append(index - 1)
+        if col + 1 < ncols and cells[index + 1] != _BLOCKED:
+            neighbors.append(index + 1)
+        if index >= ncols and cells[index - ncols] != _BLOCKED:
+            neighbors.append(index - ncols)
+        if index + ncols < len(cells) and cells[index + ncols] != _BLOCKED:
+            neighbors.append(index + ncols)
+        return neighbors
+
+    def _join_components(self, index):
+        """
+        Update labels after the cell at index was unblocked.
+        """
+        labels, parent = self._label_view, self._label_parent
+        roots = {self._find_label(labels[n])
+                 for n in self._open_neighbors(index)}
+        if roots:
+            root = min(roots)
+            for other in roots:
+                parent[other] = root
+        else:
+            root = self._new_label()
+            labels = self._label_view
+        labels[index] = root
+
+    def _split_component(self, index):
+        """
+        Update labels after the cell at index was blocked.
+
+        Runs a breadth-first search from every open neighbor of the cell in
+        turn, one cell at a time. Searches that meet are merged. A search (or
+        merged group of searches) that runs out of cells before meeting the
+        others has found a piece cut off from the rest, and its cells get a
+        new label. The remaining piece keeps the old label, so the work is
+        proportional to the smaller pieces.
+        """
+        labels = self._label_view
+        labels[index] = -1
+        seeds = self._open_neighbors(index)
+        # Search that reached each cell, and union-find forest over searches
+        owner = {seed : i for i, seed in enumerate(seeds)}
+        group = list(range(len(seeds)))
+        queues = [deque([seed]) for seed in seeds]
+
+        def find(i):
+            while group[i] != i:
+                i = group[i]
+            return i
+
+        active = set(group)
+        while len(active) > 1:
+            for root in list(active):
+                if root not in active:
+                    # Merged into another group during this round
+                    continue
+                members = [i for i in range(len(seeds))
+                           if find(i) == root and queues[i]]
+                if not members:
+                    # Cut off: relabel the cells this group reached
+                    label = self._new_label()
+                    labels = self._label_view
+                    for cell, i in owner.items():
+                        if find(i) == root:
+                            labels[cell] = label
+                    active.discard(root)
+                    continue
+                i = members[0]
+                for neighbor in self._open_neighbors(queues[i].popleft()):
+                    j = owner.get(neighbor)
+                    if j is None:
+                        owner[neighbor] = i
+                        queues[i].append(neighbor)
+                    elif find(j) != find(i):
+                        # Two searches met: merge their groups
+                        low, high = sorted((find(i), find(j)))
+                        group[high] = low
+                        active.discard(high)
+                        active.add(low)
+                if len(active) < 2:
+                    break
+
     def possible_next_locations(self, loc):
         """
         Given the current location, determine valid locations for the next
@@ -101,18 +469,20 @@ class Maze(object):
         possible_locations : List[MazeLocation]
             List of allowed locations for the next move on the grid
         """
+        cells, ncols = self._cells, self._ncols
+        index = loc.row * ncols + loc.col
         possible_locations = []
         # Check left
-        if loc.col > 0 and self._grid[loc.row][loc.col - 1] != Cell.blocked:
+        if loc.col > 0 and cells[index - 1] != _BLOCKED:
             possible_locations.append(MazeLocation(loc.row, loc.col - 1))
         # Check right
-        if loc.col + 1 < self._ncols and self._grid[loc.row][loc.col + 1] != Cell.blocked:
+        if loc.col + 1 < ncols and cells[index + 1] != _BLOCKED:
             possible_locations.append(MazeLocation(loc.row, loc.col + 1))
         # Check top
-        if loc.row > 0 and self._grid[loc.row - 1][loc.col] != Cell.blocked:
+        if loc.row > 0 and cells[index - ncols] != _BLOCKED:
             possible_locations.append(MazeLocation(loc.row - 1, loc.col))
         # Check bottom
-        if loc.row + 1 < self._nrows and self._grid[loc.row + 1][loc.col] != Cell.blocked:
+        if loc.row + 1 < self._nrows and cells[index + ncols] != _BLOCKED:
             possible_locations.append(MazeLocation(loc.row + 1, loc.col))
         return possible_locations
 
@@ -125,20 +495,96 @@ class Maze(object):
         path : list
             List of MazeLocation objects representing path.
         """
-        for ml in path:
-            self._grid[ml.row][ml.col] = Cell.path
+        if len(path):
+            rows, cols = np.asarray(path, dtype=np.intp).T
+            self._grid[rows, cols] = _PATH
         # Re-label start and end
-        self._grid[self.start.row][self.start.col] = Cell.start
-        self._grid[self.goal.row][self.goal.col] = Cell.goal
+        self._grid[self.start.row, self.start.col] = _START
+        self._grid[self.goal.row, self.goal.col] = _GOAL
 
     def clear_path(self):
         """
         Remove path visualization from maze, if any.
         """
-        for i, row in enumerate(self._grid):
-            for j, cell in enumerate(row):
-                if cell == Cell.path:
-                    self._grid[i][j] = Cell.empty
+        self._grid[self._grid == _PATH] = _EMPTY
+
+def _label_components(open_cells):
+    """
+    Label the 4-connected components of the True cells of a 2D boolean array.
+
+    Returns a flat array of consecutive labels starting at 0, with -1 for
+    False cells. Components are found with vectorized hooking and pointer
+    jumping over the edges between neighboring open cells, which takes
+    O(log(nrows * ncols)) rounds.
+
+    Labels and indices are int32 unless the grid has 2**31 cells or more.
+    The pass holds about 50 bytes per cell at its peak (labels, parents and
+    the endpoints of up to two edges per cell), so it is meant for grids
+    that fit in memory, not for the largest memory-mapped ones.
+    """
+    nrows, ncols = open_cells.shape
+    flat = open_cells.reshape(-1)
+    dtype = np.int32 if flat.size < 2**31 else np.int64
+    index = np.arange(flat.size, dtype=dtype).reshape(nrows, ncols)
+    # Edges between horizontally and vertically adjacent open cells
+    right = open_cells[:, :-1] & open_cells[:, 1:]
+    down = open_cells[:-1, :] & open_cells[1:, :]
+    u = np.concatenate((index[:, :-1][right], index[:-1, :][down]))
+    v = np.concatenate((index[:, 1:][right], index[1:, :][down]))
+    parent = index.reshape(-1).copy()
+    while True:
+        pu, pv = parent[u], parent[v]
+        differ = pu != pv
+        if not differ.any():
+            break
+        # Hook the larger root of every edge between two trees onto the
+        # smaller one (any of them, if there are several), then flatten the
+        # trees
+        parent[np.maximum(pu, pv)[differ]] = np.minimum(pu, pv)[differ]
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+        u, v = u[differ], v[differ]
+    # Number the roots of open cells consecutively
+    roots = flat & (parent == index.reshape(-1))
+    numbers = np.cumsum(roots, dtype=dtype) - 1
+    labels = np.full(flat.size, -1, dtype=dtype)
+    labels[flat] = numbers[parent[flat]]
+    return labels
+
+def _write_header(f, nrows, ncols, start, goal, blocked_cells):
+    f.write(_HEADER.pack(_MAGIC, _VERSION, nrows, ncols, start.row, start.col,
+                         goal.row, goal.col, blocked_cells))
+
+def create_maze_file(path, nrows, ncols, start=MazeLocation(0, 0), end=None):
+    """
+    Create a maze file with no blocked cells without building the maze in
+    memory.
+
+    The grid is allocated by extending the file, which most file systems
+    store sparsely, so even a 100k x 100k maze is created instantly. Open it
+    with ``Maze.load(path, mode="r+")`` to block cells.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        File to write.
+    nrows, ncols : int
+        Size of the grid.
+    start, end : MazeLocation
+        Start and goal of the maze. The goal defaults to the bottom right
+        corner.
+    """
+    if end is None:
+        end = MazeLocation(nrows - 1, ncols - 1)
+    with open(path, "wb") as f:
+        _write_header(f, nrows, ncols, start, end, 0)
+        f.truncate(_HEADER.size + nrows * ncols)
+        for loc, value in ((start, _START), (end, _GOAL)):
+            f.seek(_HEADER.size + loc.row * ncols + loc.col)
+            f.write(bytes([value]))
 
 if __name__ == "__main__":
     import time
@@ -148,9 +594,9 @@ if __name__ == "__main__":
     end = MazeLocation(nrows - 1, ncols - 1)
     m = Maze(nrows, ncols, start=start, end=end)
     print(m)
-    tic = time.time()
+    tic = time.perf_counter()
     df_solution = dfs(m.start, m.goal_test, m.possible_next_locations)
-    toc = time.time()
+    toc = time.perf_counter()
     if df_solution is None:
         print("Depth-first search did not find solution")
     else:
@@ -161,9 +607,9 @@ if __name__ == "__main__":
         print("  Eval time: %.5f" %(toc - tic))
         print(m)
     m.clear_path()
-    tic = time.time()
+    tic = time.perf_counter()
     bf_solution = bfs(m.start, m.goal_test, m.possible_next_locations)
-    toc = time.time()
+    toc = time.perf_counter()
     if bf_solution is None:
         print("Breadth-first search failed to find solution")
     else:
@@ -175,10 +621,10 @@ if __name__ == "__main__":
         print(m)
     m.clear_path()
     heur = euclidean_distance(m.goal)
-    tic = time.time()
+    tic = time.perf_counter()
     astar_solution = a_star(m.start, m.goal_test, m.possible_next_locations,
                             grid_cost, heur)
-    toc = time.time()
+    toc = time.perf_counter()
     if astar_solution is None:
         print("A* search failed to find a solution")
     else:
@@ -190,10 +636,10 @@ if __name__ == "__main__":
         print(m)
     m.clear_path()
     heur = manhattan_distance(m.goal)
-    tic = time.time()
+    tic = time.perf_counter()
     astar_solution = a_star(m.start, m.goal_test, m.possible_next_locations,
                             grid_cost, heur)
-    toc = time.time()
+    toc = time.perf_counter()
     if astar_solution is None:
         print("A* search failed to find a solution")
     else:
@@ -0,0 +1,168 @@
+"""
+Solve many (start, goal) queries against one maze in a pool of processes.
+
+The maze grid is copied once into a block of shared memory that every worker
+attaches to read-only, so only the queries and the resulting paths are
+pickled between processes.
+"""
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory, util
+import time
+
+from maze import MazeLocation, grid_cost, manhattan_distance
+from search import a_star, node_to_path
+
+class SharedGrid(object):
+    """
+    Read-only view of a maze grid stored as one byte per cell (non-zero for
+    blocked cells), with the same successor rules as Maze.
+    """
+    def __init__(self, buffer, nrows, ncols):
+        self._cells = buffer
+        self._nrows = nrows
+        self._ncols = ncols
+
+    def possible_next_locations(self, loc):
+        """
+        Same moves, in the same order, as Maze.possible_next_locations.
+        """
+        cells, ncols = self._cells, self._ncols
+        index = loc.row * ncols + loc.col
+        possible_locations = []
+        # Check left
+        if loc.col > 0 and not cells[index - 1]:
+            possible_locations.append(MazeLocation(loc.row, loc.col - 1))
+        # Check right
+        if loc.col + 1 < ncols and not cells[index + 1]:
+            possible_locations.append(MazeLocation(loc.row, loc.col + 1))
+        # Check top
+        if loc.row > 0 and not cells[index - ncols]:
+            possible_locations.append(MazeLocation(loc.row - 1, loc.col))
+        # Check bottom
+        if loc.row + 1 < self._nrows and not cells[index + ncols]:
+            possible_locations.append(MazeLocation(loc.row + 1, loc.col))
+        return possible_locations
+
+# Per-process state set up by _attach
+_shared = None
+_grid = None
+_heuristic = None
+
+def _attach(name, nrows, ncols, heuristic):
+    """
+    Worker initializer: attach to the shared grid, and detach again when the
+    worker exits.
+    """
+    global _shared, _grid, _heuristic
+    _shared = shared_memory.SharedMemory(name=name)
+    # A read-only view, so a worker cannot change the grid under the others
+    _grid = SharedGrid(_shared.buf.toreadonly(), nrows, ncols)
+    _heuristic = heuristic
+    util.Finalize(None, _detach, exitpriority=0)
+
+def _detach():
+    """
+    Release the view of the shared grid and close this worker's handle.
+    """
+    global _shared, _grid
+    _grid._cells.release()
+    _grid = None
+    _shared.close()
+    _shared = None
+
+def _solve_chunk(queries):
+    """
+    Solve a list of (start, goal) queries with A* in a worker process.
+    """
+    results = []
+    for start, goal in queries:
+        tic = time.perf_counter()
+        solution = a_star(start, lambda loc: loc == goal,
+                          _grid.possible_next_locations, grid_cost,
+                          _heuristic(goal))
+        path = None if solution is None else node_to_path(solution)
+        toc = time.perf_counter()
+        results.append(((start, goal), path, toc - tic))
+    return results
+
+def solve_batch(maze, queries, max_workers=None, chunksize=16,
+                heuristic=manhattan_distance):
+    """
+    Solve (start, goal) queries on a maze with A* across a process pool.
+
+    Parameters
+    ----------
+    maze : maze.Maze
+        Maze shared (read-only) by every query.
+    queries : Iterable[Tuple[MazeLocation, MazeLocation]]
+        Start and goal location of each query.
+    max_workers : int, optional
+        Number of worker processes. Defaults to the number of CPUs.
+    chunksize : int
+        Number of queries sent to a worker at once.
+    heuristic : Callable
+        Module-level factory taking the goal and returning the A* heuristic,
+        e.g. maze.manhattan_distance or maze.euclidean_distance.
+
+    Yields
+    ------
+    query : Tuple[MazeLocation, MazeLocation]
+        The (start, goal) query.
+    path : List[MazeLocation]
+        Path from start to goal, or None if the goal is unreachable.
+    elapsed : float
+        Time in seconds spent solving the query in the worker.
+
+    Results are yielded in completion order, not in query order. They
+    arrive one chunk at a time: every result of a chunk is yielded as soon as
+    the whole chunk is solved. If the caller stops iterating early, queries
+    that have not started yet are cancelled.
+    """
+    blocked = maze.blocked_mask()
+    nrows, ncols = blocked.shape
+    shared = shared_memory.SharedMemory(create=True, size=max(1, blocked.size))
+    try:
+        shared.buf[:blocked.size] = blocked.tobytes()
+        pool = ProcessPoolExecutor(max_workers=max_workers,
+                                   initializer=_attach,
+                                   initargs=(shared.name, nrows, ncols,
+                                             heuristic))
+        try:
+            queries = list(queries)
+            futures = [pool.submit(_solve_chunk, queries[i:i + chunksize])
+                       for i in range(0, len(queries), chunksize)]
+            for future in as_completed(futures):
+                yield from future.result()
+        finally:
+            # Unlike leaving a with block, do not wait for queued chunks
+            pool.shutdown(cancel_futures=True)
+    finally:
+        shared.close()
+        shared.unlink()
+
+if __name__ == "__main__":
+    import random
+    from maze import Maze
+    nrows, ncols = 100, 100
+    random.seed(0)
+    m = Maze(nrows, ncols, start=MazeLocation(0, 0),
+             end=MazeLocation(nrows - 1, ncols - 1))
+    def random_location():
+        return MazeLocation(random.randrange(nrows), random.randrange(ncols))
+    queries = [(random_location(), random_location()) for _ in range(500)]
+
+    tic = time.perf_counter()
+    for query in queries:
+        a_star(query[0], lambda loc: loc == query[1],
+               m.possible_next_locations, grid_cost,
+               manhattan_distance(query[1]))
+    toc = time.perf_counter()
+    print("Serial:  {} queries in {:.3f} s".format(len(queries), toc - tic))
+
+    tic = time.perf_counter()
+    times = [elapsed for _, _, elapsed in solve_batch(m, queries)]
+    toc = time.perf_counter()
+    times.sort()
+    print("Batched: {} queries in {:.3f} s".format(len(times), toc - tic))
+    print("  per-query median {:.4f} s, max {:.4f} s".format(
+          times[len(times) // 2], times[-1]))
@@ -0,0 +1,242 @@
+"""
+Bounded, thread-safe memoization.
+
+BoundedCache keeps computed values within a budget on the number of entries
+and/or on their size in bytes, evicting the least recently (LRU) or least
+frequently (LFU) used entries first. It can write every value through to an
+on-disk shelf, which outlives the process and is consulted before
+recomputing. The memoize decorator caches a function's results in one.
+"""
+from collections import OrderedDict
+from functools import wraps
+import shelve
+import sys
+import threading
+
+class _KwargsMark(object):
+    """
+    Separator between positional and keyword arguments in memoize keys. Its
+    repr is fixed, so keys keep their identity in the disk tier too.
+    """
+    def __repr__(self):
+        return "<kwargs>"
+
+    def __reduce__(self):
+        return "_KWARGS_MARK"
+
+_KWARGS_MARK = _KwargsMark()
+
+def _default_size(key, value):
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+class BoundedCache(object):
+    """
+    Key-value cache with a size budget, an eviction policy, hit, miss and
+    eviction counters, and an optional persistent tier on disk.
+
+    Every method may be called from several threads at once.
+    """
+    def __init__(self, max_entries=None, max_bytes=None, policy="lru",
+                 size=_default_size, disk_path=None):
+        """
+        Parameters
+        ----------
+        max_entries : int, optional
+            Largest number of entries kept in memory.
+        max_bytes : int, optional
+            Largest total size of the entries kept in memory, as measured by
+            size. Entries larger than the whole budget are not kept.
+        policy : {"lru", "lfu"}
+            Evict the least recently used entry, or the least frequently used
+            one (the least recently used among those on ties).
+        size : Callable
+            Callable taking a key and its value and returning its size in
+            bytes. Defaults to the sys.getsizeof of both.
+        disk_path : str, optional
+            File name of a shelve database that every value is written
+            through to. Values missing from memory are looked up there before
+            they count as a miss. Keys are stored by their repr, so they
+            must have a repr that identifies them (ints, strings, tuples of
+            those, ...). The disk tier is not bounded.
+        """
+        if policy not in ("lru", "lfu"):
+            raise ValueError("Unknown eviction policy {}".format(policy))
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self._size = size
+        self._lock = threading.RLock()
+        # key -> [value, size, use count]
+        self._entries = {}
+        # Keys from first to last to evict: one OrderedDict in recency order
+        # for LRU, or one per use count for LFU
+        self._order = OrderedDict()
+        self._by_count = {}
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self._disk = None if disk_path is None else shelve.open(disk_path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key, default=None):
+        """
+        Return the value cached for key, or default (counted as a miss).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._touch(key, entry)
+                return entry[0]
+            if self._disk is not None:
+                disk_key = repr(key)
+                if disk_key in self._disk:
+                    self.disk_hits += 1
+                    value = self._disk[disk_key]
+                    self._insert(key, value)
+                    return value
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """
+        Cache value for key, evicting other entries to stay within budget.
+        """
+        with self._lock:
+            if self._disk is not None:
+                self._disk[repr(key)] = value
+            if key in self._entries:
+                self._remove(key)
+            self._insert(key, value)
+
+    def clear(self):
+        """
+        Drop every entry held in memory (the disk tier is kept).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._order.clear()
+            self._by_count.clear()
+            self.nbytes = 0
+
+    def close(self):
+        """
+        Close the disk tier, if any.
+        """
+        with self._lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
+
+    def info(self):
+        """
+        Counters and current size of the cache, as a dict.
+        """
+        with self._lock:
+            return {"hits" : self.hits, "misses" : self.misses,
+                    "disk_hits" : self.disk_hits,
+                    "evictions" : self.evictions,
+                    "entries" : len(self._entries), "nbytes" : self.nbytes}
+
+    def _queue(self, count):
+        """
+        Eviction order of the keys with the given use count.
+        """
+        if self.policy == "lru":
+            return self._order
+        return self._by_count.setdefault(count, OrderedDict())
+
+    def _touch(self, key, entry):
+        if self.policy == "lru":
+            self._order.move_to_end(key)
+            return
+        # Move the key to the queue of the next use count
+        queue = self._by_count[entry[2]]
+        del queue[key]
+        if not queue:
+            del self._by_count[entry[2]]
+        entry[2] += 1
+        self._queue(entry[2])[key] = None
+
+    def _insert(self, key, value):
+        size = self._size(key, value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._entries[key] = [value, size, 1]
+        self._queue(1)[key] = None
+        self.nbytes += size
+        while ((self.max_entries is not None and
+                len(self._entries) > self.max_entries) or
+               (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+            self._evict(key)
+
+    def _evict(self, newest):
+        """
+        Evict one entry, never the one just inserted (newest) unless it is
+        the only one.
+        """
+        if self.policy == "lru":
+            queue = self._order
+        else:
+            # The least used queue that holds something other than newest
+            queue = None
+            for count in sorted(self._by_count):
+                candidate = self._by_count[count]
+                if len(candidate) > 1 or newest not in candidate:
+                    queue = candidate
+                    break
+        if queue is None:
+            victim = newest
+        else:
+            victim = next(iter(queue))
+            if victim == newest and len(self._entries) > 1:
+                victim = next(key for key in queue if key != newest)
+        self._remove(victim)
+        self.evictions += 1
+
+    def _remove(self, key):
+        _, size, count = self._entries.pop(key)
+        queue = self._queue(count)
+        del queue[key]
+        if self.policy == "lfu" and not queue:
+            del self._by_count[count]
+        self.nbytes -= size
+
+def memoize(max_entries=None, max_bytes=None, policy="lru",
+            size=_default_size, disk_path=None):
+    """
+    Decorator caching a function's results in a BoundedCache, keyed by its
+    arguments (which must be hashable). See BoundedCache for the parameters.
+
+    The cache is available as the ``cache`` attribute of the decorated
+    function. Values are computed outside the cache lock, so two threads
+    asking for the same missing value at once may both compute it.
+    """
+    def decorator(function):
+        cache = BoundedCache(max_entries=max_entries, max_bytes=max_bytes,
+                             policy=policy, size=size, disk_path=disk_path)
+        missing = object()
+
+        @wraps(function)
+        def memoized(*args, **kwargs):
+            key = args
+            if kwargs:
+                # The marker keeps keyword calls apart from positional calls
+                # with the same items
+                key += (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+            value = cache.get(key, missing)
+            if value is missing:
+                value = function(*args, **kwargs)
+                cache.put(key, value)
+            return value
+        memoized.cache = cache
+        return memoized
+    return decorator
@@ -0,0 +1,152 @@
+"""
+Incremental replanning on a changing maze with Lifelong Planning A* (LPA*).
+
+LPA* keeps two cost estimates for every cell it has touched: g, the cost of
+the best path found so far, and rhs, a one-step lookahead computed from the
+neighbors' g values. A cell is consistent when the two agree. After some
+cells of the maze are blocked or unblocked, only the cells around the change
+become inconsistent, and replanning only has to repair those instead of
+searching again from scratch.
+
+See Koenig, Likhachev and Furcy, "Lifelong Planning A*", Artificial
+Intelligence 155 (2004).
+"""
+from data_structures import IndexedPriorityQueue
+from maze import MazeLocation, manhattan_distance
+
+class LPAStar(object):
+    """
+    Shortest path planner between the start and goal of a maze.Maze that
+    reuses its previous search when maze cells change.
+
+    Usage::
+
+        planner = LPAStar(maze)
+        path = planner.plan()
+        maze.set_blocked(loc)
+        planner.update([loc])
+        path = planner.plan()
+    """
+    def __init__(self, maze, heuristic=None):
+        """
+        Parameters
+        ----------
+        maze : maze.Maze
+            Maze to plan on. Cells may change between calls to plan(), as
+            long as every changed cell is passed to update().
+        heuristic : Callable, optional
+            Consistent heuristic estimating the distance from a location to
+            the goal. Defaults to the manhattan distance.
+        """
+        self._maze = maze
+        self._start = maze.start
+        self._goal = maze.goal
+        self._heuristic = heuristic or manhattan_distance(maze.goal)
+        self._g = {}
+        self._rhs = {self._start : 0}
+        # Inconsistent cells, ordered by key; entries are (key, cell)
+        self._queue = IndexedPriorityQueue(key=lambda entry: entry[1])
+        self._queue.push((self._key(self._start), self._start))
+        # Number of cells expanded by the last call to plan()
+        self.expanded = 0
+
+    def _key(self, loc):
+        best = min(self._g.get(loc, float("inf")),
+                   self._rhs.get(loc, float("inf")))
+        return (best + self._heuristic(loc), best)
+
+    def _neighbors(self, loc):
+        """
+        In-bounds cells next to loc, whether blocked or not.
+        """
+        neighbors = []
+        if loc.col > 0:
+            neighbors.append(MazeLocation(loc.row, loc.col - 1))
+        if loc.col + 1 < self._maze.ncols:
+            neighbors.append(MazeLocation(loc.row, loc.col + 1))
+        if loc.row > 0:
+            neighbors.append(MazeLocation(loc.row - 1, loc.col))
+        if loc.row + 1 < self._maze.nrows:
+            neighbors.append(MazeLocation(loc.row + 1, loc.col))
+        return neighbors
+
+    def _update_cell(self, loc):
+        """
+        Recompute the lookahead cost of loc and requeue it if inconsistent.
+        """
+        inf = float("inf")
+        if loc != self._start:
+            rhs = inf
+            if not self._maze.is_blocked(loc):
+                g = self._g
+                for neighbor in self._neighbors(loc):
+                    if not self._maze.is_blocked(neighbor):
+                        rhs = min(rhs, g.get(neighbor, inf) + 1)
+            self._rhs[loc] = rhs
+        if loc in self._queue:
+            self._queue.remove(loc)
+        if self._g.get(loc, inf) != self._rhs.get(loc, inf):
+            self._queue.push((self._key(loc), loc))
+
+    def plan(self):
+        """
+        Compute (or repair) the shortest path from the start to the goal.
+
+        Returns
+        -------
+        path : List[MazeLocation]
+            Locations from start to goal, or None if the goal is unreachable.
+        """
+        inf = float("inf")
+        g, rhs, queue, goal = self._g, self._rhs, self._queue, self._goal
+        self.expanded = 0
+        while not queue.empty and (queue.peek()[0] < self._key(goal) or
+                                   rhs.get(goal, inf) != g.get(goal, inf)):
+            loc = queue.pop()[1]
+            self.expanded += 1
+            if g.get(loc, inf) > rhs.get(loc, inf):
+                # Overconsistent: the cost of loc went down
+                g[loc] = rhs[loc]
+                for neighbor in self._neighbors(loc):
+                    self._update_cell(neighbor)
+            else:
+                # Underconsistent: the cost of loc went up
+                g[loc] = inf
+                self._update_cell(loc)
+                for neighbor in self._neighbors(loc):
+                    self._update_cell(neighbor)
+        return self.path()
+
+    def update(self, changed):
+        """
+        Tell the planner which cells of the maze were blocked or unblocked
+        since the last call to plan().
+
+        Parameters
+        ----------
+        changed : Iterable[MazeLocation]
+            Changed cells.
+        """
+        for loc in changed:
+            self._update_cell(loc)
+            for neighbor in self._neighbors(loc):
+                self._update_cell(neighbor)
+
+    def path(self):
+        """
+        Follow the cheapest neighbors back from the goal to read the current
+        shortest path, or None if the goal is unreachable.
+        """
+        inf = float("inf")
+        g = self._g
+        if g.get(self._goal, inf) == inf:
+            return None
+        path = [self._goal]
+        loc = self._goal
+        while loc != self._start:
+            loc = min((n for n in self._neighbors(loc)
+                       if not self._maze.is_blocked(n)),
+                      key=lambda n: g.get(n, inf))
+            path.append(loc)
+        path.reverse()
+        return path
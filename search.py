@@ -1,12 +1,21 @@
 """
 Generic search algorithms implemented in python.
 """
-from data_structures import Stack, Queue, PriorityQueue
+from array import array
+from functools import wraps
+from heapq import heapify, heappush, heappop, nsmallest
+import inspect
+from itertools import chain, count
+from time import perf_counter
+
+from data_structures import Stack, Queue, PriorityQueue, IndexedPriorityQueue
 
 class Node(object):
     """
     Record of state during search.
     """
+    __slots__ = ("state", "parent", "cost", "heuristic")
+
     def __init__(self, state, parent_node, cost=0.0, heuristic=0.0):
         """
         Node object for keeping track of state during a generic search.
@@ -32,7 +41,192 @@ class Node(object):
     def __lt__(self, other):
         return (self.cost + self.heuristic) < (other.cost + other.heuristic)
 
-def dfs(initial, goal_test, successors):
+class SearchStats(object):
+    """
+    Opt-in statistics collected by a search engine.
+
+    Pass an instance as the ``stats`` keyword argument of any engine in this
+    module; the engine fills it in and still returns its usual result. When
+    ``stats`` is omitted the engines skip all bookkeeping.
+
+    Attributes
+    ----------
+    expanded : int
+        Number of nodes whose successors were generated.
+    generated : int
+        Number of new nodes created for successor states.
+    duplicates : int
+        Successor states skipped because they were already explored, plus
+        stale nodes popped after a cheaper path to their state was found.
+    peak_frontier : int
+        Largest number of nodes held in the frontier.
+    peak_explored : int
+        Largest number of states held in the explored set.
+    goal_test_time, successors_time, heuristic_time : float
+        Seconds spent inside the goal_test, successors (and predecessors)
+        and heuristic callbacks.
+    wall_time : float
+        Total seconds spent in the engine, including the callbacks.
+    """
+    def __init__(self):
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.peak_frontier = 0
+        self.peak_explored = 0
+        self.goal_test_time = 0.0
+        self.successors_time = 0.0
+        self.heuristic_time = 0.0
+        self.wall_time = 0.0
+        self._hooks = {"expand" : [], "generate" : [], "finish" : []}
+
+    def __repr__(self):
+        return ("SearchStats(expanded={}, generated={}, duplicates={}, "
+                "peak_frontier={}, peak_explored={}, wall_time={:.6f})".format(
+                    self.expanded, self.generated, self.duplicates,
+                    self.peak_frontier, self.peak_explored, self.wall_time))
+
+    def add_hook(self, event, hook):
+        """
+        Register a callable to run on a search event.
+
+        Parameters
+        ----------
+        event : str
+            "expand" hooks are called with each node about to be expanded,
+            "generate" hooks with each newly generated node and "finish"
+            hooks with the result returned by the engine.
+        hook : Callable
+            Callable taking a single argument.
+        """
+        if event not in self._hooks:
+            raise ValueError("Unknown search event: {}".format(event))
+        self._hooks[event].append(hook)
+
+    def record_expansion(self, node, frontier_size, explored_size):
+        """
+        Count an expansion and update the peak frontier and explored sizes.
+        """
+        self.expanded += 1
+        if frontier_size > self.peak_frontier:
+            self.peak_frontier = frontier_size
+        if explored_size > self.peak_explored:
+            self.peak_explored = explored_size
+        for hook in self._hooks["expand"]:
+            hook(node)
+
+    def record_generation(self, node):
+        """
+        Count a newly generated node.
+        """
+        self.generated += 1
+        for hook in self._hooks["generate"]:
+            hook(node)
+
+    def _timed(self, callback, attribute):
+        # Wrap a search callback so its run time accumulates into attribute
+        def timed(*args):
+            tic = perf_counter()
+            try:
+                return callback(*args)
+            finally:
+                setattr(self, attribute,
+                        getattr(self, attribute) + perf_counter() - tic)
+        return timed
+
+# Search callbacks that are timed when statistics are collected
+_timed_callbacks = {"goal_test" : "goal_test_time",
+                    "successors" : "successors_time",
+                    "predecessors" : "successors_time",
+                    "heuristic" : "heuristic_time",
+                    "reverse_heuristic" : "heuristic_time"}
+
+def _instrumented(engine):
+    """
+    Decorator adding callback timing, wall time and finish hooks to a search
+    engine whenever it is called with a SearchStats ``stats`` keyword.
+
+    Generator engines are timed only while they run, not while they are
+    suspended, and their finish hooks run when they return (not if they are
+    abandoned early).
+    """
+    signature = inspect.signature(engine)
+
+    def bind(stats, args, kwargs):
+        # Arguments with every timed callback wrapped
+        bound = signature.bind(*args, **kwargs)
+        for name, attribute in _timed_callbacks.items():
+            callback = bound.arguments.get(name)
+            if callback is not None:
+                bound.arguments[name] = stats._timed(callback, attribute)
+        return bound
+
+    if inspect.isgeneratorfunction(engine):
+        @wraps(engine)
+        def generator_wrapper(*args, **kwargs):
+            stats = kwargs.get("stats")
+            if stats is None:
+                return (yield from engine(*args, **kwargs))
+            bound = bind(stats, args, kwargs)
+            search = engine(*bound.args, **bound.kwargs)
+            try:
+                while True:
+                    tic = perf_counter()
+                    try:
+                        node = next(search)
+                    except StopIteration as stop:
+                        result = stop.value
+                        break
+                    finally:
+                        stats.wall_time += perf_counter() - tic
+                    yield node
+            finally:
+                search.close()
+            for hook in stats._hooks["finish"]:
+                hook(result)
+            return result
+        return generator_wrapper
+
+    @wraps(engine)
+    def wrapper(*args, **kwargs):
+        stats = kwargs.get("stats")
+        if stats is None:
+            return engine(*args, **kwargs)
+        bound = bind(stats, args, kwargs)
+        tic = perf_counter()
+        result = engine(*bound.args, **bound.kwargs)
+        stats.wall_time += perf_counter() - tic
+        for hook in stats._hooks["finish"]:
+            hook(result)
+        return result
+    return wrapper
+
+def run_search(search):
+    """
+    Drive a generator search engine (iter_dfs, iter_bfs, iter_a_star) to
+    completion.
+
+    The generator engines take the same arguments as their plain
+    counterparts, plus ``every``. The search advances each time the generator
+    is resumed and yields the node being expanded after every ``every``
+    expansions (never if ``every`` is None), so the caller can interleave it
+    with other work or abandon it early. The result is the generator's
+    return value.
+
+    Returns
+    -------
+    found : Generic
+        The generator's return value: the Node corresponding to successful
+        goal_test, or None if search fails.
+    """
+    while True:
+        try:
+            next(search)
+        except StopIteration as stop:
+            return stop.value
+
+def dfs(initial, goal_test, successors, explored=None, *, reachable=None,
+        stats=None):
     """
     Depth-first search.
 
@@ -44,6 +238,19 @@ def dfs(initial, goal_test, successors):
         Callable returing boolean value indicating search success.
     successors : Callable
         Callable returning list of next possible locations in search space.
+    explored : set, optional
+        Empty set-like container (supporting ``add`` and ``in``) used to
+        record visited states. Defaults to a hash set. A BitSet is a compact
+        alternative for states that map onto integers (e.g.
+        ``BitSet(nrows * ncols, maze.location_index)``), and a BloomFilter
+        bounds memory for huge implicit state spaces at the risk of skipping
+        states that were never visited.
+    reachable : Callable, optional
+        Callable taking the initial state and returning False when no goal
+        can be reached from it, e.g. Maze.goal_reachable. The search then
+        returns None at once instead of exhausting the search space.
+    stats : SearchStats, optional
+        Collects counters and callback timings for this search when given.
 
     Returns
     -------
@@ -51,13 +258,31 @@ def dfs(initial, goal_test, successors):
         Node corresponding to successful goal_test.
         Returns None if search fails.
     """
+    return run_search(iter_dfs(initial, goal_test, successors, explored,
+                               every=None, reachable=reachable,
+                               stats=stats))
+
+@_instrumented
+def iter_dfs(initial, goal_test, successors, explored=None, every=1, *,
+             reachable=None, stats=None):
+    """
+    Depth-first search as a generator.
+
+    Takes the same arguments as dfs, plus ``every``; see run_search.
+    """
+    # Give up at once if no goal can be reached
+    if reachable is not None and not reachable(initial):
+        return None
     # References to candidate and previously-explored nodes in search space
     frontier = Stack()
-    explored = Stack()
+    if explored is None:
+        explored = set()
 
     # Initialize candidate search locations with initial condition
     frontier.push(Node(initial, None))
+    explored.add(initial)
 
+    expansions = 0
     # Continue search as long as their are candidates in the search space
     while not frontier.empty:
         current_node = frontier.pop()
@@ -65,20 +290,36 @@ def dfs(initial, goal_test, successors):
         # If current node meets goal, then search completes successfully
         if goal_test(current_state):
             return current_node
+        if stats is not None:
+            stats.record_expansion(current_node, len(frontier), len(explored))
+        expansions += 1
+        if every and expansions % every == 0:
+            yield current_node
         # Populate next step in search
         for child in successors(current_state):
             # Skip previously-explored states
-            if child in explored: 
+            if child in explored:
+                if stats is not None:
+                    stats.duplicates += 1
                 continue
-            explored.push(child)
-            frontier.push(Node(child, current_node))
+            explored.add(child)
+            child_node = Node(child, current_node)
+            frontier.push(child_node)
+            if stats is not None:
+                stats.record_generation(child_node)
     # Search terminates without finding goal
     return None
 
-def a_star(initial, goal_test, successors, cost, heuristic):
+def a_star(initial, goal_test, successors, cost, heuristic, frontier=None,
+           consistent=False, *, reachable=None, stats=None):
     """
     A* search using priority queue.
 
+    States are closed once expanded. Queued nodes that were superseded by a
+    cheaper path to the same state are skipped when popped (lazy deletion),
+    so a state is only expanded again if a cheaper path to it is found after
+    it was closed, which can only happen with an inconsistent heuristic.
+
     Parameters
     ----------
     initial : Generic
@@ -92,6 +333,29 @@ def a_star(initial, goal_test, successors, cost, heuristic):
         search space.
     heuristic : Callable
         Heuristic to evaluate proposed nodes
+    frontier : PriorityQueue, optional
+        Empty queue used to hold candidate nodes. The default PriorityQueue
+        pushes a new node every time a cheaper path to a state is found,
+        leaving the stale nodes in the heap. An IndexedPriorityQueue keyed on
+        the node state (``IndexedPriorityQueue(key=lambda n: n.state)``)
+        instead updates the queued node in place with decrease_key. When
+        costs and heuristic values are small non-negative integers (e.g.
+        grid_cost with manhattan_distance), a BucketQueue keyed on the total
+        cost (``BucketQueue(priority=lambda n: n.cost + n.heuristic)``)
+        gives amortized O(1) push and pop. This requires a consistent
+        heuristic so that popped priorities never decrease.
+    consistent : bool
+        Promise that the heuristic is consistent, i.e. that
+        ``heuristic(parent) <= step cost + heuristic(child)`` for every move.
+        The first expansion of a state is then always along a cheapest path,
+        so successors that are already closed are skipped without looking up
+        their cost. Leave False for heuristics that are only admissible.
+    reachable : Callable, optional
+        Callable taking the initial state and returning False when no goal
+        can be reached from it, e.g. Maze.goal_reachable. The search then
+        returns None at once instead of exhausting the search space.
+    stats : SearchStats, optional
+        Collects counters and callback timings for this search when given.
 
     Returns
     -------
@@ -99,33 +363,80 @@ def a_star(initial, goal_test, successors, cost, heuristic):
         Node corresponding to successful goal_test.
         Returns None if search fails.
     """
+    return run_search(iter_a_star(initial, goal_test, successors, cost,
+                                  heuristic, frontier, consistent,
+                                  every=None, reachable=reachable,
+                                  stats=stats))
+
+@_instrumented
+def iter_a_star(initial, goal_test, successors, cost, heuristic,
+                frontier=None, consistent=False, every=1, *, reachable=None,
+                stats=None):
+    """
+    A* search as a generator.
+
+    Takes the same arguments as a_star, plus ``every``; see run_search.
+    """
+    # Give up at once if no goal can be reached
+    if reachable is not None and not reachable(initial):
+        return None
     # Initialize frontier
-    frontier = PriorityQueue()
+    if frontier is None:
+        frontier = PriorityQueue()
+    indexed = isinstance(frontier, IndexedPriorityQueue)
     frontier.push(Node(initial, None, cost=0.0,
                        heuristic=heuristic(initial)))
     # Structure for holding explored nodes (with their costs)
     explored = {initial : 0.0}
+    # States that have been expanded
+    closed = set()
 
+    expansions = 0
     # Continue search as long as their are candidates in the search space
     while not frontier.empty:
         current_node = frontier.pop()
         current_state = current_node.state
+        # Skip stale nodes: a cheaper path to this state was found after
+        # this node was queued
+        if current_node.cost > explored[current_state]:
+            if stats is not None:
+                stats.duplicates += 1
+            continue
         # If current node meets goal, then search completes successfully
         if goal_test(current_state):
             return current_node
+        closed.add(current_state)
+        if stats is not None:
+            stats.record_expansion(current_node, len(frontier), len(explored))
+        expansions += 1
+        if every and expansions % every == 0:
+            yield current_node
+        # Every successor is reached through the same move from current_node
+        new_cost = cost(current_node)
         # Populate next step in search
         for child in successors(current_state):
-            new_cost = cost(current_node)
-            if child not in explored or explored[child] > new_cost: 
+            if consistent and child in closed:
+                continue
+            if child not in explored or explored[child] > new_cost:
                 explored[child] = new_cost
-                frontier.push(Node(child,
-                                   parent_node=current_node,
-                                   cost=new_cost,
-                                   heuristic=heuristic(child)))
+                # Reopen a closed state reached more cheaply
+                closed.discard(child)
+                child_node = Node(child,
+                                  parent_node=current_node,
+                                  cost=new_cost,
+                                  heuristic=heuristic(child))
+                # Update a queued node in place rather than adding a duplicate
+                if indexed and child in frontier:
+                    frontier.decrease_key(child_node)
+                else:
+                    frontier.push(child_node)
+                if stats is not None:
+                    stats.record_generation(child_node)
     # Search terminates without finding goal
     return None
 
-def bfs(initial, goal_test, successors):
+def bfs(initial, goal_test, successors, explored=None, *, reachable=None,
+        stats=None):
     """
     Breadth-first search.
 
@@ -137,6 +448,19 @@ def bfs(initial, goal_test, successors):
         Callable returing boolean value indicating search success.
     successors : Callable
         Callable returning list of next possible locations in search space.
+    explored : set, optional
+        Empty set-like container (supporting ``add`` and ``in``) used to
+        record visited states. Defaults to a hash set. A BitSet is a compact
+        alternative for states that map onto integers (e.g.
+        ``BitSet(nrows * ncols, maze.location_index)``), and a BloomFilter
+        bounds memory for huge implicit state spaces at the risk of skipping
+        states that were never visited.
+    reachable : Callable, optional
+        Callable taking the initial state and returning False when no goal
+        can be reached from it, e.g. Maze.goal_reachable. The search then
+        returns None at once instead of exhausting the search space.
+    stats : SearchStats, optional
+        Collects counters and callback timings for this search when given.
 
     Returns
     -------
@@ -144,13 +468,31 @@ def bfs(initial, goal_test, successors):
         Node corresponding to successful goal_test.
         Returns None if search fails.
     """
+    return run_search(iter_bfs(initial, goal_test, successors, explored,
+                               every=None, reachable=reachable,
+                               stats=stats))
+
+@_instrumented
+def iter_bfs(initial, goal_test, successors, explored=None, every=1, *,
+             reachable=None, stats=None):
+    """
+    Breadth-first search as a generator.
+
+    Takes the same arguments as bfs, plus ``every``; see run_search.
+    """
+    # Give up at once if no goal can be reached
+    if reachable is not None and not reachable(initial):
+        return None
     # References to candidate and previously-explored nodes in search space
     frontier = Queue()
-    explored = Stack()
+    if explored is None:
+        explored = set()
 
     # Initialize candidate search locations with initial condition
     frontier.push(Node(initial, None))
+    explored.add(initial)
 
+    expansions = 0
     # Continue search as long as their are candidates in the search space
     while not frontier.empty:
         current_node = frontier.pop()
@@ -158,13 +500,911 @@ def bfs(initial, goal_test, successors):
         # If current node meets goal, then search completes successfully
         if goal_test(current_state):
             return current_node
+        if stats is not None:
+            stats.record_expansion(current_node, len(frontier), len(explored))
+        expansions += 1
+        if every and expansions % every == 0:
+            yield current_node
         # Populate next step in search
         for child in successors(current_state):
             # Skip previously-explored states
-            if child in explored: 
+            if child in explored:
+                if stats is not None:
+                    stats.duplicates += 1
+                continue
+            explored.add(child)
+            child_node = Node(child, current_node)
+            frontier.push(child_node)
+            if stats is not None:
+                stats.record_generation(child_node)
+    # Search terminates without finding goal
+    return None
+
+def _join_at(forward_node, backward_node):
+    """
+    Join a forward search node and a backward search node that share the same
+    state into a single chain of Nodes running from the initial state of the
+    forward search to the initial state of the backward search.
+    """
+    total = forward_node.cost + backward_node.cost
+    node = forward_node
+    while backward_node.parent is not None:
+        backward_node = backward_node.parent
+        node = Node(backward_node.state, node,
+                    cost=total - backward_node.cost)
+    return node
+
+@_instrumented
+def bidirectional_bfs(initial, goal, successors, predecessors=None, *,
+                      stats=None):
+    """
+    Bidirectional breadth-first search.
+
+    Grows one breadth-first frontier from the initial state and one from the
+    goal state, expanding a whole layer of the smaller frontier at a time, and
+    stops when the two frontiers meet.
+
+    Parameters
+    ----------
+    initial : Generic
+        Starting point of the search.
+    goal : Generic
+        Goal state of the search.
+    successors : Callable
+        Callable returning list of next possible locations in search space.
+    predecessors : Callable, optional
+        Callable returning list of states from which the given state can be
+        reached. Defaults to successors, i.e. moves are assumed symmetric.
+    stats : SearchStats, optional
+        Collects counters and callback timings for this search when given.
+
+    Returns
+    -------
+    found : Generic
+        Node for the goal state whose parent chain leads back to initial.
+        Returns None if search fails.
+    """
+    if predecessors is None:
+        predecessors = successors
+    if initial == goal:
+        return Node(initial, None)
+    # Nodes reached from each end, keyed by state. The node cost records the
+    # number of steps from the end the search started from.
+    forward = {initial : Node(initial, None)}
+    backward = {goal : Node(goal, None)}
+    forward_layer, backward_layer = [initial], [goal]
+
+    while forward_layer and backward_layer:
+        # Expand the smaller of the two frontiers by one full layer
+        if len(forward_layer) <= len(backward_layer):
+            layer, reached, other, expand = (forward_layer, forward,
+                                             backward, successors)
+        else:
+            layer, reached, other, expand = (backward_layer, backward,
+                                             forward, predecessors)
+        next_layer = []
+        best = None
+        for state in layer:
+            current_node = reached[state]
+            if stats is not None:
+                stats.record_expansion(current_node,
+                                       len(forward_layer) + len(backward_layer),
+                                       len(forward) + len(backward))
+            for child in expand(state):
+                if child in reached:
+                    if stats is not None:
+                        stats.duplicates += 1
+                    continue
+                child_node = Node(child, current_node,
+                                  cost=current_node.cost + 1)
+                reached[child] = child_node
+                next_layer.append(child)
+                if stats is not None:
+                    stats.record_generation(child_node)
+                # Frontiers meet: keep the shortest connection in this layer
+                if child in other:
+                    length = child_node.cost + other[child].cost
+                    if best is None or length < best[0]:
+                        best = (length, child)
+        if best is not None:
+            meet = best[1]
+            return _join_at(forward[meet], backward[meet])
+        if reached is forward:
+            forward_layer = next_layer
+        else:
+            backward_layer = next_layer
+    # Search terminates without finding goal
+    return None
+
+@_instrumented
+def bidirectional_a_star(initial, goal, successors, cost, heuristic,
+                         reverse_heuristic, predecessors=None, *, stats=None):
+    """
+    Bidirectional A* search.
+
+    Runs an A* search forward from the initial state and another backward
+    from the goal, always expanding the side with the smaller frontier. The
+    search stops once the cheapest connection found between the two sides is
+    no more expensive than the smallest total cost left on either frontier.
+
+    Parameters
+    ----------
+    initial : Generic
+        Starting point of the search.
+    goal : Generic
+        Goal state of the search.
+    successors : Callable
+        Callable returning list of next possible locations in search space.
+    cost : Callable
+        Cost function returning the cost of a proposed move between nodes in
+        search space. It is also used for the backward search, so moves are
+        assumed to cost the same in both directions.
+    heuristic : Callable
+        Consistent heuristic estimating the cost from a state to goal.
+    reverse_heuristic : Callable
+        Consistent heuristic estimating the cost from initial to a state.
+    predecessors : Callable, optional
+        Callable returning list of states from which the given state can be
+        reached. Defaults to successors, i.e. moves are assumed symmetric.
+    stats : SearchStats, optional
+        Collects counters and callback timings for this search when given.
+
+    Returns
+    -------
+    found : Generic
+        Node for the goal state whose parent chain leads back to initial.
+        Returns None if search fails.
+    """
+    if predecessors is None:
+        predecessors = successors
+    # One frontier and table of cheapest known nodes per direction
+    forward_frontier, backward_frontier = PriorityQueue(), PriorityQueue()
+    forward_frontier.push(Node(initial, None, cost=0.0,
+                               heuristic=heuristic(initial)))
+    backward_frontier.push(Node(goal, None, cost=0.0,
+                                heuristic=reverse_heuristic(goal)))
+    forward = {initial : forward_frontier[0]}
+    backward = {goal : backward_frontier[0]}
+    # Cheapest connection found so far, as (cost, meeting state)
+    best = (backward[initial].cost, initial) if initial in backward else None
+
+    while not forward_frontier.empty and not backward_frontier.empty:
+        # Stop when neither frontier can improve on the best connection
+        if best is not None:
+            bound = max(forward_frontier[0].cost + forward_frontier[0].heuristic,
+                        backward_frontier[0].cost + backward_frontier[0].heuristic)
+            if best[0] <= bound:
+                break
+        if len(forward_frontier) <= len(backward_frontier):
+            frontier, reached, other = forward_frontier, forward, backward
+            expand, estimate = successors, heuristic
+        else:
+            frontier, reached, other = backward_frontier, backward, forward
+            expand, estimate = predecessors, reverse_heuristic
+        current_node = frontier.pop()
+        current_state = current_node.state
+        # Skip nodes superseded by a cheaper path to the same state
+        if reached[current_state] is not current_node:
+            if stats is not None:
+                stats.duplicates += 1
+            continue
+        if stats is not None:
+            stats.record_expansion(current_node,
+                                   len(forward_frontier) + len(backward_frontier),
+                                   len(forward) + len(backward))
+        new_cost = cost(current_node)
+        for child in expand(current_state):
+            if child in reached and reached[child].cost <= new_cost:
                 continue
-            explored.push(child)
-            frontier.push(Node(child, current_node))
+            child_node = Node(child, current_node, cost=new_cost,
+                              heuristic=estimate(child))
+            reached[child] = child_node
+            frontier.push(child_node)
+            if stats is not None:
+                stats.record_generation(child_node)
+            if child in other:
+                length = new_cost + other[child].cost
+                if best is None or length < best[0]:
+                    best = (length, child)
+    if best is None:
+        # Search terminates without finding goal
+        return None
+    meet = best[1]
+    return _join_at(forward[meet], backward[meet])
+
+@_instrumented
+def ida_star(initial, goal_test, successors, cost, heuristic, max_bound=None,
+             transpositions=False, *, stats=None):
+    """
+    Iterative-deepening A* search.
+
+    Performs a series of depth-first searches, each bounded by a threshold on
+    the total estimated cost (cost + heuristic). The threshold starts at the
+    heuristic estimate of the initial state and is raised to the smallest
+    estimate that exceeded it after every unsuccessful pass. Only the current
+    path is kept in memory, at the cost of re-expanding states between
+    passes.
+
+    Parameters
+    ----------
+    initial : Generic
+        Starting point of the search.
+    goal_test : Callable
+        Callable returing boolean value indicating search success.
+    successors : Callable
+        Callable returning list of next possible locations in search space.
+    cost : Callable
+        Cost function returning the cost of a proposed move between nodes in
+        search space.
+    heuristic : Callable
+        Admissible heuristic to evaluate proposed nodes
+    max_bound : float, optional
+        Give up and return None once the threshold would exceed this cost.
+        Any bound at least the cost of the cheapest solution is safe, e.g.
+        ``nrows * ncols`` for a maze with unit step costs.
+    transpositions : bool
+        Remember the cheapest cost each state was expanded with during a
+        pass, and skip costlier paths to it. Uses memory proportional to the
+        number of states reached instead of to the path length, but a pass no
+        longer tries every cycle-free path.
+
+    Without max_bound or transpositions, a search for an unreachable goal
+    only returns None after trying every cycle-free path, which on a grid
+    with many open cells can take a very long time.
+    stats : SearchStats, optional
+        Collects counters and callback timings for this search when given.
+
+    Returns
+    -------
+    found : Generic
+        Node corresponding to successful goal_test.
+        Returns None if search fails.
+    """
+    root = Node(initial, None, cost=0.0, heuristic=heuristic(initial))
+    if goal_test(initial):
+        return root
+    threshold = root.cost + root.heuristic
+    exhausted = object()
+
+    while True:
+        # Smallest estimate that exceeded the current threshold
+        next_threshold = float("inf")
+        if stats is not None:
+            stats.record_expansion(root, 0, 1)
+        # Depth-first search stack of (node, child cost, remaining children),
+        # plus the states on the current path to avoid cycles
+        stack = [(root, cost(root), iter(successors(initial)))]
+        on_path = {initial}
+        # Cheapest cost each state was expanded with in this pass
+        best = {initial : 0.0} if transpositions else None
+        while stack:
+            current_node, child_cost, children = stack[-1]
+            child = next(children, exhausted)
+            if child is exhausted:
+                stack.pop()
+                on_path.discard(current_node.state)
+                continue
+            if child in on_path:
+                continue
+            if best is not None and child in best and best[child] <= child_cost:
+                if stats is not None:
+                    stats.duplicates += 1
+                continue
+            child_node = Node(child, current_node, cost=child_cost,
+                              heuristic=heuristic(child))
+            estimate = child_node.cost + child_node.heuristic
+            if stats is not None:
+                stats.record_generation(child_node)
+            if estimate > threshold:
+                next_threshold = min(next_threshold, estimate)
+                continue
+            if goal_test(child):
+                return child_node
+            if stats is not None:
+                stats.record_expansion(child_node, len(stack), len(on_path))
+            if best is not None:
+                best[child] = child_cost
+            on_path.add(child)
+            stack.append((child_node, cost(child_node),
+                          iter(successors(child))))
+        # Search terminates without finding goal
+        if next_threshold == float("inf"):
+            return None
+        if max_bound is not None and next_threshold > max_bound:
+            return None
+        threshold = next_threshold
+
+@_instrumented
+def beam_search(initial, goal_test, successors, cost, heuristic,
+                beam_width=100, max_depth=None, *, stats=None):
+    """
+    Beam search.
+
+    Searches breadth-first, one depth layer at a time, but keeps only the
+    beam_width nodes of each layer with the lowest total estimated cost
+    (cost + heuristic) and discards the rest. The frontier never holds more
+    than beam_width times the branching factor nodes, whatever the size of
+    the search space. Every node in the beam keeps its chain of ancestors
+    alive, though, so memory as a whole grows as O(beam_width * depth). The
+    price is that the search is incomplete and the solution is not
+    necessarily optimal: the goal can be missed, or reached along a longer
+    path, when a node on the best path falls out of the beam.
+
+    States already in the current or the previous layer are skipped, which
+    stops the beam from stepping straight back to where it came from but not
+    from walking in longer cycles. The search gives up when a whole layer
+    holds only states that were in earlier layers, so it always terminates
+    on a finite search space, e.g. when the goal is unreachable.
+
+    Parameters
+    ----------
+    initial : Generic
+        Starting point of the search.
+    goal_test : Callable
+        Callable returing boolean value indicating search success.
+    successors : Callable
+        Callable returning list of next possible locations in search space.
+    cost : Callable
+        Cost function returning the cost of a proposed move between nodes in
+        search space.
+    heuristic : Callable
+        Heuristic to evaluate proposed nodes
+    beam_width : int
+        Number of nodes kept per depth layer.
+    max_depth : int, optional
+        Give up after this many layers.
+    stats : SearchStats, optional
+        Collects counters and callback timings for this search when given.
+
+    Returns
+    -------
+    found : Generic
+        Node corresponding to successful goal_test.
+        Returns None if search fails.
+    """
+    def estimate(node):
+        return node.cost + node.heuristic
+
+    layer = [Node(initial, None, cost=0.0, heuristic=heuristic(initial))]
+    previous = set()
+    # Every state that has been in a layer
+    seen = {initial}
+    depth = 0
+    while layer:
+        # Layers are sorted by estimate, so the first goal is the best one
+        for current_node in layer:
+            if goal_test(current_node.state):
+                return current_node
+        if max_depth is not None and depth >= max_depth:
+            break
+        depth += 1
+        current = {node.state for node in layer}
+        # Cheapest candidate for each state of the next layer
+        candidates = {}
+        for current_node in layer:
+            if stats is not None:
+                stats.record_expansion(current_node, len(layer),
+                                       len(candidates))
+            new_cost = cost(current_node)
+            for child in successors(current_node.state):
+                if child in current or child in previous:
+                    if stats is not None:
+                        stats.duplicates += 1
+                    continue
+                if child in candidates and candidates[child].cost <= new_cost:
+                    continue
+                child_node = Node(child, current_node, cost=new_cost,
+                                  heuristic=heuristic(child))
+                candidates[child] = child_node
+                if stats is not None:
+                    stats.record_generation(child_node)
+        previous = current
+        layer = nsmallest(beam_width, candidates.values(), key=estimate)
+        # Give up once the beam only revisits states
+        new_states = {node.state for node in layer} - seen
+        if not new_states:
+            break
+        seen |= new_states
+    # Search terminates without finding goal
+    return None
+
+@_instrumented
+def anytime_a_star(initial, goal_test, successors, cost, heuristic,
+                   weight=3.0, weight_step=0.5, time_limit=None,
+                   max_expansions=None, *, stats=None):
+    """
+    Anytime weighted A* search (ARA*).
+
+    Starts as weighted A* with total cost estimate ``cost + weight *
+    heuristic``, which usually finds a first, possibly suboptimal solution
+    after few expansions. While the budget allows, the weight is lowered by
+    weight_step down to 1 and the search continues from its existing
+    frontier, re-expanding only states whose cost improved, until the
+    solution is proven optimal.
+
+    Parameters
+    ----------
+    initial : Generic
+        Starting point of the search.
+    goal_test : Callable
+        Callable returing boolean value indicating search success.
+    successors : Callable
+        Callable returning list of next possible locations in search space.
+    cost : Callable
+        Cost function returning the cost of a proposed move between nodes in
+        search space.
+    heuristic : Callable
+        Admissible heuristic to evaluate proposed nodes. It should be zero
+        for goal states.
+    weight : float
+        Initial heuristic weight (>= 1).
+    weight_step : float
+        Amount the weight is lowered by after each improved solution.
+    time_limit : float, optional
+        Seconds after which the best solution found so far is returned.
+    max_expansions : int, optional
+        Number of expansions after which the best solution found so far is
+        returned.
+    stats : SearchStats, optional
+        Collects counters and callback timings for this search when given.
+
+    Returns
+    -------
+    found : Generic
+        Node of the cheapest solution found, or None if none was found
+        within the budget (or none exists).
+    bound : float
+        Suboptimality bound: the cost of found is at most bound times the
+        optimal cost. 1.0 means found is optimal; infinite if found is None.
+    """
+    if weight < 1:
+        raise ValueError("weight must be >= 1")
+    if weight_step <= 0:
+        raise ValueError("weight_step must be positive")
+    inf = float("inf")
+    deadline = None if time_limit is None else perf_counter() + time_limit
+    expansions = 0
+    tie = count()
+    # Cheapest known node for each state
+    best = {initial : Node(initial, None, cost=0.0,
+                           heuristic=heuristic(initial))}
+    # States waiting for expansion at the current weight, states whose cost
+    # improved after they were expanded at the current weight, and states
+    # expanded at the current weight
+    open_states = {initial}
+    inconsistent = set()
+    closed = set()
+    frontier = []
+    incumbent = None
+    # Weight for which the incumbent is known to be within bound
+    proven = inf
+
+    def key(node):
+        return node.cost + weight * node.heuristic
+
+    def rebuild_frontier():
+        frontier.clear()
+        for state in open_states:
+            node = best[state]
+            frontier.append((key(node), node.heuristic, next(tie), node))
+        heapify(frontier)
+
+    def lower_bound():
+        # Cheapest admissible estimate among the states not yet settled
+        candidates = [best[s].cost + best[s].heuristic
+                      for s in chain(open_states, inconsistent)]
+        if incumbent is not None:
+            candidates.append(incumbent.cost)
+        return min(candidates) if candidates else inf
+
+    def result():
+        if incumbent is None:
+            return None, inf
+        bound = proven
+        lb = lower_bound()
+        if lb > 0:
+            bound = min(bound, incumbent.cost / lb)
+        elif incumbent.cost == 0:
+            bound = 1.0
+        return incumbent, max(1.0, bound)
+
+    rebuild_frontier()
+    while True:
+        # Expand states until no frontier key can beat the incumbent
+        while frontier:
+            entry = frontier[0]
+            current_node = entry[-1]
+            current_state = current_node.state
+            # Skip entries superseded by a cheaper node or already expanded
+            if best[current_state] is not current_node or \
+               current_state not in open_states:
+                heappop(frontier)
+                if stats is not None:
+                    stats.duplicates += 1
+                continue
+            if incumbent is not None and entry[0] >= incumbent.cost:
+                break
+            if (max_expansions is not None and expansions >= max_expansions) \
+               or (deadline is not None and perf_counter() >= deadline):
+                return result()
+            heappop(frontier)
+            open_states.discard(current_state)
+            if goal_test(current_state):
+                if incumbent is None or current_node.cost < incumbent.cost:
+                    incumbent = current_node
+                continue
+            closed.add(current_state)
+            expansions += 1
+            if stats is not None:
+                stats.record_expansion(current_node, len(open_states),
+                                       len(best))
+            new_cost = cost(current_node)
+            for child in successors(current_state):
+                if child in best and best[child].cost <= new_cost:
+                    continue
+                h = best[child].heuristic if child in best else heuristic(child)
+                child_node = Node(child, current_node, cost=new_cost,
+                                  heuristic=h)
+                best[child] = child_node
+                if stats is not None:
+                    stats.record_generation(child_node)
+                if child in closed:
+                    inconsistent.add(child)
+                else:
+                    open_states.add(child)
+                    heappush(frontier, (key(child_node), h, next(tie),
+                                        child_node))
+        # Every reachable state was expanded without meeting the goal
+        if incumbent is None:
+            return None, inf
+        # The incumbent is within a factor weight of the optimum
+        proven = min(proven, weight)
+        if weight <= 1:
+            return result()
+        # Tighten the weight and reuse the frontier
+        weight = max(1.0, weight - weight_step)
+        open_states |= inconsistent
+        inconsistent.clear()
+        closed.clear()
+        rebuild_frontier()
+
+class _MemoryBoundedNode(Node):
+    """
+    Node with the extra bookkeeping needed by sma_star.
+    """
+    __slots__ = ("estimate", "depth", "children", "unseen", "forgotten",
+                 "version", "alive")
+
+    def __init__(self, state, parent_node, cost, heuristic, estimate, depth):
+        super().__init__(state, parent_node, cost=cost, heuristic=heuristic)
+        # Backed-up total cost estimate and depth below the root
+        self.estimate = estimate
+        self.depth = depth
+        # Children currently in memory
+        self.children = []
+        # Successor states never generated yet (None until first expansion)
+        self.unseen = None
+        # Successor states dropped from memory, with their backed-up estimates
+        self.forgotten = {}
+        # Incremented whenever the node changes, to invalidate heap entries
+        self.version = 0
+        self.alive = True
+
+    @property
+    def is_open(self):
+        return self.unseen is None or bool(self.unseen) or bool(self.forgotten)
+
+@_instrumented
+def sma_star(initial, goal_test, successors, cost, heuristic,
+             max_nodes=100000, *, stats=None):
+    """
+    Simplified memory-bounded A* (SMA*) search.
+
+    Behaves like A* until the number of nodes held in memory reaches
+    max_nodes. From then on, the shallowest leaf with the highest estimate
+    is dropped to make room for each new node. Its estimate is backed up into
+    its parent, so the dropped subtree is only regenerated once every other
+    path looks worse.
+
+    Parameters
+    ----------
+    initial : Generic
+        Starting point of the search.
+    goal_test : Callable
+        Callable returing boolean value indicating search success.
+    successors : Callable
+        Callable returning list of next possible locations in search space.
+    cost : Callable
+        Cost function returning the cost of a proposed move between nodes in
+        search space.
+    heuristic : Callable
+        Admissible heuristic to evaluate proposed nodes
+    max_nodes : int
+        Hard cap on the number of search nodes held in memory. A goal is only
+        reachable if its path has fewer than max_nodes states. If no solution
+        fits within the cap, or the goal is unreachable and the reachable
+        states do not fit, the search keeps regenerating forgotten paths and
+        can take a very long time to return None.
+    stats : SearchStats, optional
+        Collects counters and callback timings for this search when given.
+
+    Returns
+    -------
+    found : Generic
+        Node corresponding to successful goal_test.
+        Returns None if search fails.
+    """
+    if max_nodes < 2:
+        raise ValueError("max_nodes must be at least 2")
+    inf = float("inf")
+    counter = count()
+    root_h = heuristic(initial)
+    root = _MemoryBoundedNode(initial, None, 0.0, root_h, root_h, 0)
+    live = {root}
+    # Cheapest node in memory for each state, used to drop dominated paths
+    reached = {initial : root}
+    # Candidates for expansion: lowest estimate first, deepest on ties
+    frontier = []
+    # Candidates for removal: highest estimate first, shallowest on ties
+    leaves = []
+
+    def push(node):
+        if node.is_open:
+            heappush(frontier, (node.estimate, -node.depth, next(counter),
+                                node.version, node))
+        if not node.children and node is not root:
+            heappush(leaves, (-node.estimate, node.depth, next(counter),
+                              node.version, node))
+
+    def set_estimate(node, estimate):
+        node.estimate = estimate
+        node.version += 1
+        push(node)
+
+    def backup(node):
+        # Propagate the cheapest estimate among the children of fully
+        # generated nodes towards the root
+        while node is not None and node.unseen == []:
+            estimates = [c.estimate for c in node.children]
+            estimates.extend(node.forgotten.values())
+            new_estimate = min(estimates) if estimates else inf
+            if new_estimate == node.estimate:
+                break
+            set_estimate(node, new_estimate)
+            node = node.parent
+
+    def forget(node):
+        # Drop a leaf from memory, remembering its estimate in the parent
+        node.alive = False
+        live.discard(node)
+        if reached.get(node.state) is node:
+            del reached[node.state]
+        parent = node.parent
+        parent.children.remove(node)
+        parent.forgotten[node.state] = node.estimate
+        parent.version += 1
+        push(parent)
+        backup(parent)
+
+    def pop_valid(heap, valid):
+        while heap:
+            entry = heappop(heap)
+            node = entry[-1]
+            if node.alive and entry[-2] == node.version and valid(node):
+                return node
+        return None
+
+    push(root)
+    while True:
+        # Drop stale heap entries once they dominate the heaps
+        if len(frontier) + len(leaves) > 2 * max_nodes + 64:
+            frontier.clear()
+            leaves.clear()
+            for node in live:
+                push(node)
+        best = pop_valid(frontier, lambda n: n.is_open)
+        # Search terminates without finding goal
+        if best is None or best.estimate == inf:
+            return None
+        if goal_test(best.state):
+            return best
+        if best.unseen is None:
+            if stats is not None:
+                stats.record_expansion(best, len(frontier), len(live))
+            best.unseen = list(successors(best.state))
+            best.unseen.reverse()
+        # Generate the next successor, regenerating forgotten ones last
+        if best.unseen:
+            child = best.unseen.pop()
+            estimate = 0.0
+        elif best.forgotten:
+            child = min(best.forgotten, key=best.forgotten.get)
+            estimate = best.forgotten.pop(child)
+        else:
+            # Dead end: nothing left to generate and no children
+            set_estimate(best, inf)
+            if best is not root and not best.children:
+                forget(best)
+            continue
+        child_cost = cost(best)
+        # A path at least as cheap to this state is already in memory
+        if child in reached and reached[child].cost <= child_cost:
+            if stats is not None:
+                stats.duplicates += 1
+            best.version += 1
+            push(best)
+            backup(best)
+            continue
+        child_h = heuristic(child)
+        depth = best.depth + 1
+        estimate = max(estimate, best.estimate, child_cost + child_h)
+        # A path this deep cannot be extended within the memory budget
+        if depth >= max_nodes - 1 and not goal_test(child):
+            estimate = inf
+        # Make room for the new node
+        if len(live) >= max_nodes:
+            worst = pop_valid(leaves, lambda n: not n.children
+                              and n is not best and n is not root)
+            if worst is None:
+                best.forgotten[child] = inf
+                best.version += 1
+                push(best)
+                continue
+            forget(worst)
+        child_node = _MemoryBoundedNode(child, best, child_cost, child_h,
+                                        estimate, depth)
+        best.children.append(child_node)
+        live.add(child_node)
+        reached[child] = child_node
+        if stats is not None:
+            stats.record_generation(child_node)
+        best.version += 1
+        push(best)
+        push(child_node)
+        backup(best)
+
+class NodeArena(object):
+    """
+    Compact store of search nodes held in parallel arrays.
+
+    Each node is identified by its integer index in the arena. States are
+    kept in a list, while parent indices, costs and heuristic values are kept
+    in typed arrays, so no per-node Python object is allocated beyond the
+    state itself.
+    """
+    def __init__(self):
+        self.states = []
+        self.parents = array("q")
+        self.costs = array("d")
+        self.heuristics = array("d")
+
+    def __len__(self):
+        return len(self.states)
+
+    def add(self, state, parent_index, cost=0.0, heuristic=0.0):
+        """
+        Store a node and return its index. Use a parent_index of -1 for the
+        root of the search.
+        """
+        self.states.append(state)
+        self.parents.append(parent_index)
+        self.costs.append(cost)
+        self.heuristics.append(heuristic)
+        return len(self.states) - 1
+
+    def path(self, index):
+        """
+        Follow parent indices back from the node at index and return the
+        states from the root of the search to that node.
+        """
+        states, parents = self.states, self.parents
+        path = [states[index]]
+        index = parents[index]
+        while index >= 0:
+            path.append(states[index])
+            index = parents[index]
+        path.reverse()
+        return path
+
+class _ArenaCursor(object):
+    """
+    Reusable stand-in for a Node, passed to cost functions by arena_a_star.
+    """
+    __slots__ = ("state", "parent", "cost", "heuristic")
+
+    def __init__(self):
+        self.state = None
+        self.parent = None
+        self.cost = 0.0
+        self.heuristic = 0.0
+
+@_instrumented
+def arena_a_star(initial, goal_test, successors, cost, heuristic, arena=None,
+                 consistent=False, *, stats=None):
+    """
+    A* search that stores its nodes in a NodeArena.
+
+    Behaves like a_star with the default PriorityQueue, but every node lives
+    in the parallel arrays of the arena and the heap holds only
+    (total cost, heuristic, index) tuples.
+
+    Parameters
+    ----------
+    initial : Generic
+        Starting point of the search.
+    goal_test : Callable
+        Callable returing boolean value indicating search success.
+    successors : Callable
+        Callable returning list of next possible locations in search space.
+    cost : Callable
+        Cost function returning the cost of a proposed move between nodes in
+        search space. It is called with a single reused node-like object
+        exposing the state, cost and heuristic of the node being expanded
+        (its parent attribute is the parent index), so it must not keep a
+        reference to it.
+    heuristic : Callable
+        Heuristic to evaluate proposed nodes
+    arena : NodeArena, optional
+        Empty arena to hold the search nodes. A new one is created if not
+        given; pass one in to inspect the costs of the nodes afterwards.
+    consistent : bool
+        Promise that the heuristic is consistent; see a_star.
+    stats : SearchStats, optional
+        Collects counters and callback timings for this search when given.
+        Hooks receive node indices instead of Nodes.
+
+    Returns
+    -------
+    path : List
+        States from initial to the state that passed goal_test, as
+        NodeArena.path returns them. Returns None if search fails.
+    """
+    if arena is None:
+        arena = NodeArena()
+    states, parents = arena.states, arena.parents
+    costs, heuristics = arena.costs, arena.heuristics
+    cursor = _ArenaCursor()
+    h = heuristic(initial)
+    # Heap of (total cost, heuristic, index); ties on total cost go to the
+    # node estimated to be closest to the goal
+    frontier = [(h, h, arena.add(initial, -1, 0.0, h))]
+    # Structure for holding explored states (with their costs)
+    explored = {initial : 0.0}
+    # States that have been expanded
+    closed = set()
+
+    # Continue search as long as their are candidates in the search space
+    while frontier:
+        index = heappop(frontier)[2]
+        current_state = states[index]
+        # Skip stale entries superseded by a cheaper path to the same state
+        if costs[index] > explored[current_state]:
+            if stats is not None:
+                stats.duplicates += 1
+            continue
+        # If current node meets goal, then search completes successfully
+        if goal_test(current_state):
+            return arena.path(index)
+        closed.add(current_state)
+        if stats is not None:
+            stats.record_expansion(index, len(frontier), len(explored))
+        cursor.state = current_state
+        cursor.parent = parents[index]
+        cursor.cost = costs[index]
+        cursor.heuristic = heuristics[index]
+        new_cost = cost(cursor)
+        # Populate next step in search
+        for child in successors(current_state):
+            if consistent and child in closed:
+                continue
+            if child not in explored or explored[child] > new_cost:
+                explored[child] = new_cost
+                closed.discard(child)
+                h = heuristic(child)
+                child_index = arena.add(child, index, new_cost, h)
+                heappush(frontier, (new_cost + h, h, child_index))
+                if stats is not None:
+                    stats.record_generation(child_index)
     # Search terminates without finding goal
     return None
 
@@ -0,0 +1,62 @@
+"""
+Tests for fib_batch.fib_mod against the reference implementation in fib.
+
+Run with ``python -m pytest`` from the top of the repository.
+"""
+import numpy as np
+import pytest
+
+from fib import iterative, fast_doubling
+from fib_batch import fib_mod, pisano_period, MAX_MODULUS
+
+def test_matches_iterative():
+    rng = np.random.default_rng(0)
+    n = rng.integers(0, 3000, size=2000)
+    m = rng.integers(1, MAX_MODULUS, size=2000)
+    assert all(iterative(int(i)) % int(j) == k
+               for i, j, k in zip(n, m, fib_mod(n, m)))
+
+def test_small_moduli_and_indices():
+    n, m = np.meshgrid(np.arange(200), np.arange(1, 60))
+    expected = [[iterative(int(i)) % int(j) for i, j in zip(row_n, row_m)]
+                for row_n, row_m in zip(n, m)]
+    assert fib_mod(n, m).tolist() == expected
+
+def test_edge_cases():
+    assert fib_mod(0, 7) == 0
+    assert fib_mod(1, 7) == 1
+    assert fib_mod(12345, 1) == 0
+    assert fib_mod(0, 1) == 0
+    assert fib_mod(2, MAX_MODULUS) == 1
+
+def test_empty():
+    result = fib_mod(np.array([], dtype=np.int64), 5)
+    assert result.shape == (0,) and result.dtype == np.int64
+
+def test_broadcasting():
+    n = np.arange(10)[:, None]
+    m = np.array([2, 3, 10])
+    result = fib_mod(n, m)
+    assert result.shape == (10, 3)
+    assert result.tolist() == [[iterative(i) % j for j in (2, 3, 10)]
+                               for i in range(10)]
+
+def test_large_indices():
+    # uint64 values above the int64 range, and Python ints beyond uint64
+    n = np.array([2**63 + 5, 2**64 - 1], dtype=np.uint64)
+    m = np.array([1000, 999983])
+    assert fib_mod(n, m).tolist() == [fast_doubling(int(i), int(j))
+                                      for i, j in zip(n, m)]
+    big = np.array([10**30, 3**70], dtype=object)
+    assert fib_mod(big, 10**9 + 7).tolist() == [
+        fast_doubling(i, 10**9 + 7) for i in big]
+
+def test_pisano_period():
+    # Known periods
+    assert [pisano_period(m) for m in (1, 2, 3, 5, 10, 100)] == \
+           [1, 3, 8, 20, 60, 300]
+
+@pytest.mark.parametrize("n, m", [(-1, 5), (3, 0), (3, MAX_MODULUS + 1)])
+def test_invalid(n, m):
+    with pytest.raises(ValueError):
+        fib_mod(n, m)
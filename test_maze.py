@@ -0,0 +1,85 @@
+"""
+Tests for maze.Maze.
+
+Run with ``python -m pytest`` from the top of the repository.
+"""
+import copy
+import os
+import pickle
+import time
+
+import pytest
+
+from maze import Maze, MazeLocation, create_maze_file
+
+def make_maze(size=30, seed=3):
+    return Maze(size, size, blocked_fraction=0.3, start=MazeLocation(0, 0),
+                end=MazeLocation(size - 1, size - 1), seed=seed)
+
+@pytest.mark.parametrize("clone", [lambda m: pickle.loads(pickle.dumps(m)),
+                                   copy.deepcopy],
+                         ids=["pickle", "deepcopy"])
+def test_clone(clone):
+    m = make_maze()
+    # Label components first, so their views are cloned too
+    m.goal_reachable(m.start)
+    c = clone(m)
+    assert str(c) == str(m)
+    assert c.goal_reachable(c.start) == m.goal_reachable(m.start)
+    # The clone is independent of the original
+    loc = MazeLocation(5, 5)
+    c.set_blocked(loc, not c.is_blocked(loc))
+    assert c.is_blocked(loc) != m.is_blocked(loc)
+    assert c.possible_next_locations(MazeLocation(5, 4)) != \
+           m.possible_next_locations(MazeLocation(5, 4))
+
+def test_save_load_round_trip(tmp_path):
+    m = make_maze()
+    path = tmp_path / "m.maze"
+    m.save(path)
+    loaded = Maze.load(path)
+    assert str(loaded) == str(m)
+    assert (loaded.start, loaded.goal) == (m.start, m.goal)
+    assert loaded._blocked_cells == m._blocked_cells
+
+@pytest.mark.parametrize("mode", ["r", "r+", "c"])
+def test_save_to_own_file(tmp_path, mode):
+    path = tmp_path / "m.maze"
+    make_maze().save(path)
+    m = Maze.load(path, mode=mode)
+    loc = MazeLocation(5, 5)
+    if mode != "r":
+        m.set_blocked(loc, not m.is_blocked(loc))
+    expected = str(m)
+    m.save(path)
+    # The maze is still readable through its map, and the file is complete
+    assert str(m) == expected
+    loaded = Maze.load(path)
+    assert str(loaded) == expected
+    assert loaded._blocked_cells == m._blocked_cells
+    assert os.path.getsize(path) == m.nrows * m.ncols + 64
+
+def test_load_large_file_in_constant_time(tmp_path):
+    # A 10 GB grid, stored sparsely
+    size = 100000
+    path = tmp_path / "large.maze"
+    create_maze_file(path, size, size)
+    tic = time.perf_counter()
+    m = Maze.load(path, mode="r+")
+    assert time.perf_counter() - tic < 0.5
+    assert (m.nrows, m.ncols) == (size, size)
+    assert m.goal == MazeLocation(size - 1, size - 1)
+
+    # Block a few cells, save in place and load again
+    blocked = [MazeLocation(1, 0), MazeLocation(0, 2),
+               MazeLocation(size // 2, size // 3)]
+    for loc in blocked:
+        m.set_blocked(loc)
+    m.save(path)
+    assert os.path.getsize(path) == size * size + 64
+    loaded = Maze.load(path)
+    assert loaded._blocked_cells == len(blocked)
+    assert all(loaded.is_blocked(loc) for loc in blocked)
+    assert not loaded.is_blocked(MazeLocation(1, 1))
+    assert loaded.possible_next_locations(loaded.start) == \
+           [MazeLocation(0, 1)]
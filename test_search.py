@@ -0,0 +1,50 @@
+"""
+Tests for the A* closed set: with a consistent heuristic, no state is
+expanded more than once, whatever the frontier.
+
+Run with ``python -m pytest`` from the top of the repository.
+"""
+from collections import Counter
+
+import pytest
+
+from data_structures import PriorityQueue, IndexedPriorityQueue, BucketQueue
+from maze import Maze, MazeLocation, grid_cost, manhattan_distance
+from search import a_star, bfs, node_to_path
+
+FRONTIERS = {
+    "priority" : PriorityQueue,
+    "indexed" : lambda: IndexedPriorityQueue(key=lambda n: n.state),
+    "bucket" : lambda: BucketQueue(priority=lambda n: n.cost + n.heuristic),
+}
+
+def counting_successors(maze):
+    """
+    Wrap maze.possible_next_locations to count how often each state is
+    expanded.
+    """
+    calls = Counter()
+    def successors(loc):
+        calls[loc] += 1
+        return maze.possible_next_locations(loc)
+    return successors, calls
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("frontier", sorted(FRONTIERS))
+@pytest.mark.parametrize("consistent", [False, True])
+def test_a_star_expands_each_state_once(seed, frontier, consistent):
+    size = 40
+    m = Maze(size, size, blocked_fraction=0.3, start=MazeLocation(0, 0),
+             end=MazeLocation(size - 1, size - 1), seed=seed)
+    successors, calls = counting_successors(m)
+    solution = a_star(m.start, m.goal_test, successors, grid_cost,
+                      manhattan_distance(m.goal),
+                      frontier=FRONTIERS[frontier](), consistent=consistent)
+    assert calls, "search expanded nothing"
+    assert max(calls.values()) == 1
+    # Still a shortest path
+    shortest = bfs(m.start, m.goal_test, m.possible_next_locations)
+    if shortest is None:
+        assert solution is None
+    else:
+        assert len(node_to_path(solution)) == len(node_to_path(shortest))